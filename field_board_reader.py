@@ -1,18 +1,21 @@
 """
 Field Board Reader for detecting troops on the game board.
-Uses color template matching for accurate troop detection on the battlefield.
+Uses grayscale template matching with a color check for accurate troop detection on the battlefield.
 """
 
 import cv2
 import numpy as np
-import pyautogui
 import tkinter as tk
 from tkinter import ttk
+import tkinter.font as tkFont
+import os
+import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from troop_definitions import TROOP_REGISTRY, get_troop_by_icon_name
-import math
+from screen_capture import ScreenCapture, sleep_until_next_frame
 
 class HexagonalBoardState:
     """
@@ -20,6 +23,8 @@ class HexagonalBoardState:
     Rows are offset every other row. Only bottom 4 rows are playable.
     """
     
+    verbose = False  # Print the hexagon layout whenever it's (re)built
+    
     def __init__(self, board_left, board_top, board_width, board_height):
         self.board_left = board_left
         self.board_top = board_top
@@ -34,6 +39,10 @@ class HexagonalBoardState:
         # Store troop positions
         self.hexagon_troops = {}  # {(row, col): [troop_detections]}
         
+        # Generous distance check (squared, so lookups can skip the sqrt)
+        max_hex_radius = max(self.board_width / self.cols, self.board_height / self.rows) * 1.5
+        self._max_radius_sq = max_hex_radius ** 2
+        
         # Calculate hexagon positions based on the pink dot pattern
         self.hexagon_centers = self.calculate_hexagon_centers()
     
@@ -41,7 +50,8 @@ class HexagonalBoardState:
         """Calculate the precise hexagon center positions based on actual game coordinates"""
         centers = {}
         
-        print("Using precise hexagon coordinates from game analysis")
+        if self.verbose:
+            print("Using precise hexagon coordinates from game analysis")
         
         # Precise Y coordinates for each row (8 rows total)
         row_y_positions = [538, 594, 650, 706, 763, 819, 875, 932]
@@ -66,28 +76,24 @@ class HexagonalBoardState:
                 x = x_start + (col * x_spacing)
                 centers[(row, col)] = (x, y)
                 
-                print(f"  Hex Row {row+1}, Col {col+1} at ({x}, {y})")
+                if self.verbose:
+                    print(f"  Hex Row {row+1}, Col {col+1} at ({x}, {y})")
+        
+        # Flat arrays of the centers for vectorized nearest-hexagon lookups
+        self._hex_keys = list(centers.keys())
+        self._hex_xs = np.array([centers[key][0] for key in self._hex_keys], dtype=np.float32)
+        self._hex_ys = np.array([centers[key][1] for key in self._hex_keys], dtype=np.float32)
         
         return centers
     
     def find_closest_hexagon(self, x, y):
         """Find the closest hexagon to a given screen coordinate"""
-        min_distance = float('inf')
-        closest_hex = None
+        # Squared distance to ALL hexagons at once
+        distances_sq = (self._hex_xs - x)**2 + (self._hex_ys - y)**2
+        closest = int(np.argmin(distances_sq))
         
-        # Check ALL hexagons to find the closest
-        for (row, col), (hex_x, hex_y) in self.hexagon_centers.items():
-            distance = math.sqrt((x - hex_x)**2 + (y - hex_y)**2)
-            
-            if distance < min_distance:
-                min_distance = distance
-                closest_hex = (row, col)
-        
-        # Generous distance check
-        max_hex_radius = max(self.board_width / self.cols, self.board_height / self.rows) * 1.5
-        
-        if min_distance <= max_hex_radius:
-            return closest_hex
+        if distances_sq[closest] <= self._max_radius_sq:
+            return self._hex_keys[closest]
         
         return None
     
@@ -102,6 +108,36 @@ class HexagonalBoardState:
             return hex_pos
         return None
     
+    def assign_batch(self, detections):
+        """
+        Assign a whole frame of troop detections to hexagons in one pass.
+        
+        Args:
+            detections (list): Detection dicts with 'center_x' and 'center_y'
+            
+        Returns:
+            List with the (row, col) hexagon for each detection, or None if it's off the board
+        """
+        if not detections:
+            return []
+        
+        points_x = np.array([d['center_x'] for d in detections], dtype=np.float32)
+        points_y = np.array([d['center_y'] for d in detections], dtype=np.float32)
+        
+        # (detections x hexagons) squared distances in one broadcast
+        distances_sq = (points_x[:, None] - self._hex_xs)**2 + (points_y[:, None] - self._hex_ys)**2
+        closest = np.argmin(distances_sq, axis=1)
+        in_range = distances_sq[np.arange(len(detections)), closest] <= self._max_radius_sq
+        
+        hex_positions = []
+        for detection, hex_index, valid in zip(detections, closest.tolist(), in_range.tolist()):
+            hex_pos = self._hex_keys[hex_index] if valid else None
+            if hex_pos:
+                self.hexagon_troops.setdefault(hex_pos, []).append(detection)
+            hex_positions.append(hex_pos)
+        
+        return hex_positions
+    
     def clear_board(self):
         """Clear all troops from the board"""
         self.hexagon_troops.clear()
@@ -162,19 +198,45 @@ class FieldBoardReader:
         
         # Detection settings optimized for field troops
         self.preprocessed_templates = {}
-        self.scales = np.array([0.8, 0.9, 1.0, 1.1, 1.2])  # Different scales for field detection
+        self._gray_templates = {}  # Same layout as preprocessed_templates, single channel
+        self._small_templates = {}  # {icon: gray template at 1/4 size} for the pyramid pre-filter
+        self._icon_names = []
+        self.pyramid_levels = 2  # Pre-filter on the board shrunk by 2**levels
+        self.prefilter_margin = 0.15  # How far below threshold a coarse hit may score
+        
+        # Icons are matched in parallel (matchTemplate releases the GIL). OpenCV's own
+        # threading is turned off so the workers don't oversubscribe the cores
+        cv2.setNumThreads(1)
+        self._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        self._result_buffers = threading.local()  # One reusable matchTemplate output per worker
+        # Plain float tuples - the scales double as template dict keys
+        self.scales = (0.8, 1.0, 1.2)  # Coarse scales searched across the board
+        self.refine_scales = (0.9, 1.1)  # In-between scales only checked around coarse peaks
         self.threshold = 0.7  # Lower threshold for color matching
         
         self.running = False
         self.overlay_visible = False
         self.capture_thread = None
+        # Newest (detections, process_time) from the detection thread - a single slot, so the UI
+        # only ever draws the latest frame and stale ones are dropped if it falls behind
+        self._detection_queue = queue.Queue(maxsize=1)
+        self._delivery_pending = threading.Event()  # Set while a _deliver_detections call is scheduled
         self.overlay_canvas = None
-        self.screen_width = pyautogui.size().width
-        self.screen_height = pyautogui.size().height
+        self.board_grid_pixels = None  # Board area the overlay rectangle was last drawn at
+        self._board_update_id = None  # Pending debounced board-area rebuild
+        self._overlay_key = None  # What the detection items on the overlay currently show
+        self._board_text_shown = None  # Text currently in the board state display
+        # Query the screen size once from Tk instead of asking pyautogui twice
+        self.screen_width = self.root.winfo_screenwidth()
+        self.screen_height = self.root.winfo_screenheight()
         
         self.monitor_width = self.screen_width
         self.monitor_height = self.screen_height
         
+        # Board area in pixels - only changes when the sliders move
+        self._board_pixels = None
+        self._recompute_board_pixels()
+        
         self.current_detections = []
         self.hexagonal_board = None  # Will be initialized when board area is set
         
@@ -192,9 +254,10 @@ class FieldBoardReader:
             return
         
         icon_files = list(icons_dir.glob("*.png"))
-        total_templates = len(icon_files) * len(self.scales)
+        all_scales = self.scales + self.refine_scales
+        total_templates = len(icon_files) * len(all_scales)
         
-        print(f"Processing {len(icon_files)} field icons at {len(self.scales)} scales = {total_templates} templates")
+        print(f"Processing {len(icon_files)} field icons at {len(all_scales)} scales = {total_templates} templates")
         
         for icon_file in icon_files:
             icon_name = icon_file.stem
@@ -208,8 +271,16 @@ class FieldBoardReader:
             
             # Create scaled versions at all scales
             self.preprocessed_templates[icon_name] = {}
+            self._gray_templates[icon_name] = {}
+            
+            # Shrunk copy of the unscaled template for the coarse pre-filter pass
+            template_small = cv2.cvtColor(template_bgr, cv2.COLOR_BGR2GRAY)
+            for _ in range(self.pyramid_levels):
+                template_small = cv2.pyrDown(template_small)
+            if min(template_small.shape[:2]) >= 5:
+                self._small_templates[icon_name] = template_small
             
-            for scale in self.scales:
+            for scale in all_scales:
                 # Get original dimensions
                 template_height, template_width = template_bgr.shape[:2]
                 
@@ -224,8 +295,12 @@ class FieldBoardReader:
                 # Create scaled template
                 template_scaled = cv2.resize(template_bgr, (new_width, new_height))
                 
-                # Store preprocessed template (in color)
+                # Store preprocessed template (in color for verification, gray for matching)
                 self.preprocessed_templates[icon_name][scale] = template_scaled
+                self._gray_templates[icon_name][scale] = cv2.cvtColor(template_scaled, cv2.COLOR_BGR2GRAY)
+        
+        # Stable icon order for the per-frame loop, so frames never touch the filesystem
+        self._icon_names = list(self.preprocessed_templates.keys())
         
         print(f"✅ Color preprocessing complete! {len(self.preprocessed_templates)} field icons ready for detection")
         
@@ -321,7 +396,7 @@ class FieldBoardReader:
         monitor_info_frame = ttk.LabelFrame(self.root, text="Monitor & Board Area Information")
         monitor_info_frame.pack(pady=5, padx=10, fill=tk.X)
         
-        left, top, right, bottom = self.get_board_area_pixels()
+        left, top, right, bottom = self._board_pixels
         monitor_info = f"Screen: {self.screen_width}x{self.screen_height}\n"
         monitor_info += f"Board Area: ({left},{top}) to ({right},{bottom})\n"
         monitor_info += f"Board Size: {right-left}x{bottom-top} pixels"
@@ -370,13 +445,24 @@ class FieldBoardReader:
         self.top_label.config(text=f"{self.board_area['top_percent']}%")
         self.bottom_label.config(text=f"{self.board_area['bottom_percent']}%")
         
+        self._recompute_board_pixels()
+        
         # Update monitor info
-        left, top, right, bottom = self.get_board_area_pixels()
+        left, top, right, bottom = self._board_pixels
         monitor_info = f"Screen: {self.screen_width}x{self.screen_height}\n"
         monitor_info += f"Board Area: ({left},{top}) to ({right},{bottom})\n"
         monitor_info += f"Board Size: {right-left}x{bottom-top} pixels"
         self.monitor_label.config(text=monitor_info)
         
+        # Sliders fire on every pixel of a drag - coalesce the heavier updates into one
+        if self._board_update_id is not None:
+            self.root.after_cancel(self._board_update_id)
+        self._board_update_id = self.root.after(150, self._apply_board_area)
+    
+    def _apply_board_area(self):
+        """Redraw the board area and rebuild the hexagonal board once the sliders settle"""
+        self._board_update_id = None
+        
         # If overlay is visible, update the board area display
         if self.overlay_visible and self.overlay_canvas:
             self.draw_board_grid()
@@ -386,26 +472,29 @@ class FieldBoardReader:
     
     def update_hexagonal_board(self):
         """Update the hexagonal board state with current dimensions"""
-        left, top, right, bottom = self.get_board_area_pixels()
+        left, top, right, bottom = self._board_pixels
         board_width = right - left
         board_height = bottom - top
         
         self.hexagonal_board = HexagonalBoardState(left, top, board_width, board_height)
 
-    def get_board_area_pixels(self):
-        """Convert board area percentages to pixel coordinates"""
+    def _recompute_board_pixels(self):
+        """Convert board area percentages to pixel coordinates and cache them"""
         left = int(self.monitor_width * self.board_area['left_percent'] / 100)
         right = int(self.monitor_width * self.board_area['right_percent'] / 100)
         top = int(self.monitor_height * self.board_area['top_percent'] / 100)
         bottom = int(self.monitor_height * self.board_area['bottom_percent'] / 100)
-        return left, top, right, bottom
+        self._board_pixels = (left, top, right, bottom)
+    
+    def get_board_area_pixels(self):
+        """Get the board area as (left, top, right, bottom) pixel coordinates"""
+        return self._board_pixels
         
     def create_overlay_window(self):
         """Create a transparent overlay window for drawing board grid and detections"""
         self.overlay_window = tk.Toplevel(self.root)
         self.overlay_window.title("Board Overlay")
         self.overlay_window.attributes('-topmost', True)
-        self.overlay_window.attributes('-alpha', 0.7)
         
         # Position for the screen
         monitor_x_offset = 0
@@ -413,7 +502,7 @@ class FieldBoardReader:
         self.overlay_window.configure(bg='black')
         self.overlay_window.overrideredirect(True)
         
-        # Make the window background transparent
+        # Make the window background transparent via color key (no full-window alpha blend)
         self.overlay_window.wm_attributes('-transparentcolor', 'black')
         
         self.overlay_canvas = tk.Canvas(self.overlay_window, 
@@ -422,6 +511,10 @@ class FieldBoardReader:
                                       bg='black', highlightthickness=0)
         self.overlay_canvas.pack()
         
+        # One shared font object for all detection labels
+        self._label_font = tkFont.Font(self.overlay_window, family='Arial', size=8, weight='bold')
+        self._overlay_key = None
+        
         # Initially hide the overlay
         self.overlay_window.withdraw()
     
@@ -457,13 +550,13 @@ class FieldBoardReader:
             self.overlay_window.deiconify()
             self.overlay_visible = True
             
-            # Clear and draw just the board area
-            self.overlay_canvas.delete("all")
+            # Clear detections and draw just the board area
+            self.overlay_canvas.delete("detection")
+            self._overlay_key = None
             self.draw_board_grid()
             
-            # Force canvas update
-            self.overlay_canvas.update()
-            self.overlay_window.update()
+            # Flush pending redraws only - update() would also pump input events
+            self.overlay_window.update_idletasks()
             
             print("Test board area displayed with grid!")
             
@@ -534,6 +627,7 @@ class FieldBoardReader:
                 # Clear overlay
                 if self.overlay_canvas:
                     self.overlay_canvas.delete("all")
+                    self._overlay_key = None
         except tk.TclError:
             self.overlay_visible = False
             self.overlay_button.config(text="Show Overlay")
@@ -542,75 +636,141 @@ class FieldBoardReader:
         
     def detection_loop(self):
         """Main board reading loop running in separate thread"""
+        # Created in this thread so the mss handles belong to it
+        capture = ScreenCapture()
+        next_time = time.monotonic()  # Deadline of the current frame
+        
         while self.running:
             try:
-                start_time = time.time()
+                start_time = time.perf_counter()
                 
-                # Capture screen
-                screenshot = pyautogui.screenshot()
+                # Capture just the board area (already BGR, no full-screen copy)
+                left, top, right, bottom = self._board_pixels
+                board_region = capture.grab(left, top, right - left, bottom - top)
                 
-                # Convert PIL image to OpenCV format (keep in color)
-                screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+                # Grayscale copy for matching, made once per capture and shared by all icons
+                gray_region = cv2.cvtColor(board_region, cv2.COLOR_BGR2GRAY)
                 
                 # Process with board reader
-                detections = self.process_board_screenshot(screenshot_cv)
-                
-                # Update UI in main thread
-                self.root.after(0, self.update_overlay, detections)
+                detections = self.process_board_region(board_region, left, top, gray_region)
                 
                 # Calculate processing time
-                process_time = time.time() - start_time
+                process_time = time.perf_counter() - start_time
                 
-                # Update status
-                self.root.after(0, lambda: self.status_var.set(
-                    f"Reading board... ({process_time:.2f}s) - Found {len(detections)} troops"))
+                # Hand the frame to the main thread
+                self._publish_detections(detections, process_time)
                 
                 # Wait for next update
-                sleep_time = max(0, self.update_rate_var.get() - process_time)
-                time.sleep(sleep_time)
+                next_time = sleep_until_next_frame(next_time, self.update_rate_var.get())
                 
             except Exception as e:
-                self.root.after(0, lambda: self.status_var.set(f"Error: {e}"))
+                # Format now - e is cleared when the except block ends
+                self.root.after(0, self.status_var.set, f"Error: {e}")
                 time.sleep(1)
+        
+        capture.close()
                 
-    def process_board_screenshot(self, screenshot_cv):
-        """Process screenshot to find troops on the board and assign to hexagons"""
-        detections = []
+    def _publish_detections(self, detections, process_time):
+        """Replace any undelivered frame with this one and make sure the main thread picks it up"""
+        try:
+            self._detection_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._detection_queue.put_nowait((detections, process_time))
+        
+        # Only one delivery queued on the Tk event loop at a time
+        if not self._delivery_pending.is_set():
+            self._delivery_pending.set()
+            self.root.after(0, self._deliver_detections)
+    
+    def _deliver_detections(self):
+        """Draw the newest detections (runs in the main thread)"""
+        self._delivery_pending.clear()
+        try:
+            detections, process_time = self._detection_queue.get_nowait()
+        except queue.Empty:
+            return
         
+        # Frames still in flight after stopping would redraw the cleared overlay
+        if not self.running:
+            return
+        
+        self.update_overlay(detections)
+        self.status_var.set(f"Reading board... ({process_time:.2f}s) - Found {len(detections)} troops")
+    
+    def process_board_screenshot(self, screenshot_cv):
+        """Process a full screenshot to find troops on the board and assign to hexagons"""
         # Get board area coordinates
-        left, top, right, bottom = self.get_board_area_pixels()
+        left, top, right, bottom = self._board_pixels
         
         # Extract board region (keep in color)
-        board_region = screenshot_cv[top:bottom, left:right]
-        
-        # Get list of field icon files
-        icons_dir = Path("field_icons")
-        if not icons_dir.exists():
-            return detections
+        return self.process_board_region(screenshot_cv[top:bottom, left:right], left, top)
+    
+    def process_board_region(self, board_region, left, top, gray_region=None):
+        """
+        Find troops in an already cropped board region and assign them to hexagons.
+        
+        Args:
+            board_region: Board area in color (BGR)
+            left (int): Screen X of the region's left edge
+            top (int): Screen Y of the region's top edge
+            gray_region: Grayscale version of board_region (converted here if not given)
             
-        icon_files = list(icons_dir.glob("*.png"))
-        if not icon_files:
+        Returns:
+            List of detection dicts in screen coordinates
+        """
+        detections = []
+        
+        # Grayscale copy for matching - a third of the bytes of the color region
+        if gray_region is None:
+            gray_region = cv2.cvtColor(board_region, cv2.COLOR_BGR2GRAY)
+        
+        # Shrunk board for the coarse pass that picks out where troops might be
+        small_region = gray_region
+        for _ in range(self.pyramid_levels):
+            small_region = cv2.pyrDown(small_region)
+        
+        # Process each icon type in parallel (templates were loaded once at startup)
+        futures = [self._pool.submit(self.find_field_matches, board_region, icon_name, left, top,
+                                     gray_region, small_region)
+                   for icon_name in self._icon_names]
+        
+        # Candidates stay as flat arrays until they are turned into match dicts below
+        box_parts, score_parts, scale_parts, icon_parts = [], [], [], []
+        for icon_index, future in enumerate(futures):
+            boxes, scores, scales = future.result()
+            box_parts.append(boxes)
+            score_parts.append(scores)
+            scale_parts.append(scales)
+            icon_parts.append(np.full(len(scores), icon_index, dtype=np.int32))
+        
+        if not box_parts:
             return detections
         
-        # Process each icon type
-        for icon_file in icon_files:
-            icon_name = icon_file.stem
-            
-            # Skip if we don't have preprocessed templates for this icon
-            if icon_name not in self.preprocessed_templates:
-                continue
-            
-            matches = self.find_field_matches(board_region, icon_name, left, top)
-            
-            for match in matches:
-                detections.append(match)
+        boxes = np.concatenate(box_parts)
+        scores = np.concatenate(score_parts)
+        scales = np.concatenate(scale_parts)
+        icon_indices = np.concatenate(icon_parts)
+        
+        candidates = [self._build_match(self._icon_names[icon_indices[i]], *boxes[i].tolist(),
+                                        scores[i], scales[i])
+                      for i in range(len(scores))]
+        
+        # Color check before the overlap pass, so a look-alike icon that fails in color
+        # can't knock out the real troop first
+        candidates = self.verify_color_matches(board_region, candidates, left, top)
+        
+        # One overlap pass across all icons, so a troop can't be claimed by two icons
+        color_boxes = [[c['x'], c['y'], c['width'], c['height']] for c in candidates]
+        color_scores = [c['confidence'] for c in candidates]
+        detections = [candidates[i] for i in self._nms_keep(color_boxes, color_scores)]
         
         # Clear previous board state and assign troops to hexagons
         if self.hexagonal_board:
             self.hexagonal_board.clear_board()
             
-            for detection in detections:
-                hex_pos = self.hexagonal_board.add_troop_to_hexagon(detection)
+            hex_positions = self.hexagonal_board.assign_batch(detections)
+            for detection, hex_pos in zip(detections, hex_positions):
                 if hex_pos:
                     detection['hexagon'] = hex_pos  # Add hexagon info to detection
         else:
@@ -618,113 +778,296 @@ class FieldBoardReader:
                     
         return detections
     
-    def find_field_matches(self, region_image, icon_name, offset_x, offset_y):
-        """Find template matches using color template matching"""
-        all_matches = []
+    def find_candidate_rois(self, small_region, icon_name, region_shape):
+        """
+        Coarse pass on the shrunk board to find areas worth a full-resolution search.
+        
+        Args:
+            small_region: Grayscale board region after pyramid_levels pyrDowns
+            icon_name (str): Icon to look for
+            region_shape: Shape of the full-resolution region
+            
+        Returns:
+            List of (x0, y0, x1, y1) rectangles in full-resolution region coordinates
+        """
+        region_height, region_width = region_shape[:2]
+        template_small = self._small_templates.get(icon_name)
+        
+        # No coarse template (or board too small) - search everything
+        if (template_small is None or template_small.shape[0] > small_region.shape[0]
+                or template_small.shape[1] > small_region.shape[1]):
+            return [(0, 0, region_width, region_height)]
+        
+        result = cv2.matchTemplate(small_region, template_small, cv2.TM_CCOEFF_NORMED)
+        if result.max() < self.threshold - self.prefilter_margin:
+            return []
+        mask = (result >= self.threshold - self.prefilter_margin).astype(np.uint8)
+        
+        # Merge nearby hits into blobs so each troop becomes one ROI
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        # ROIs have to fit the largest scaled template starting anywhere in the blob
+        factor = 2 ** self.pyramid_levels
+        max_height = max(t.shape[0] for t in self._gray_templates[icon_name].values())
+        max_width = max(t.shape[1] for t in self._gray_templates[icon_name].values())
+        
+        # The coarse template is unscaled, so a larger troop lines up on its center and
+        # its top-left sits up to half the size difference up-left of the coarse hit
+        pad_x = max(0, (max_width - template_small.shape[1] * factor) // 2)
+        pad_y = max(0, (max_height - template_small.shape[0] * factor) // 2)
+        
+        rois = []
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            x0 = max(0, (x - 1) * factor - pad_x)
+            y0 = max(0, (y - 1) * factor - pad_y)
+            x1 = min(region_width, (x + w + 1) * factor + max_width)
+            y1 = min(region_height, (y + h + 1) * factor + max_height)
+            rois.append((x0, y0, x1, y1))
+        
+        return rois
+    
+    def find_field_matches(self, region_image, icon_name, offset_x, offset_y, gray_region=None, small_region=None):
+        """
+        Find template matches using grayscale template matching.
+        
+        Args:
+            region_image: Board region in color (BGR)
+            icon_name (str): Icon to look for
+            offset_x (int): Screen X of the region's left edge
+            offset_y (int): Screen Y of the region's top edge
+            gray_region: Grayscale version of region_image (converted here if not given)
+            small_region: Shrunk gray region for the pre-filter (None = search the whole region)
+            
+        Returns:
+            Tuple of (boxes, scores, scales) arrays for every candidate above threshold
+            (overlapping and not yet color checked). Boxes are (N x 4) [x, y, width, height]
+            rows in screen coordinates.
+        """
+        box_parts, score_parts, scale_parts = [], [], []
         
         # Check if we have preprocessed templates for this icon
         if icon_name not in self.preprocessed_templates:
-            return all_matches
+            return self._stack_matches(box_parts, score_parts, scale_parts)
+        
+        if gray_region is None:
+            gray_region = cv2.cvtColor(region_image, cv2.COLOR_BGR2GRAY)
         
-        # Use preprocessed color templates
+        # Only search full resolution where the coarse pass found something
+        if small_region is not None:
+            rois = self.find_candidate_rois(small_region, icon_name, gray_region.shape)
+            
+            # Coarse peak too low everywhere - the icon isn't on the board, skip all scales
+            if not rois:
+                return self._stack_matches(box_parts, score_parts, scale_parts)
+        else:
+            rois = [(0, 0, gray_region.shape[1], gray_region.shape[0])]
+        
+        # Coarse peaks (in region coordinates) that the in-between scales get checked around
+        seed_threshold = self.threshold - self.prefilter_margin
+        seed_box_parts, seed_score_parts = [], []
+        
+        # Use preprocessed grayscale templates
         for scale in self.scales:
             # Get preprocessed template for this scale
-            if scale not in self.preprocessed_templates[icon_name]:
+            if scale not in self._gray_templates[icon_name]:
                 continue
                 
-            template_scaled = self.preprocessed_templates[icon_name][scale]
-            template_height, template_width = template_scaled.shape[:2]
+            template_gray = self._gray_templates[icon_name][scale]
+            template_height, template_width = template_gray.shape[:2]
             
             # Skip if template becomes too large for region
             if template_width > region_image.shape[1] * 0.9 or template_height > region_image.shape[0] * 0.9:
                 continue
             
-            # Perform color template matching
-            result = cv2.matchTemplate(region_image, template_scaled, cv2.TM_CCOEFF_NORMED)
-            
-            # Find matches above threshold
-            locations = np.where(result >= self.threshold)
-            
-            for pt in zip(*locations[::-1]):  # Switch x and y coordinates
-                x, y = pt
-                confidence = result[y, x]
+            for roi_x0, roi_y0, roi_x1, roi_y1 in rois:
+                roi = gray_region[roi_y0:roi_y1, roi_x0:roi_x1]
+                if roi.shape[0] < template_height or roi.shape[1] < template_width:
+                    continue
                 
-                # Calculate actual screen coordinates
-                actual_x = int(x + offset_x)
-                actual_y = int(y + offset_y)
+                # Perform grayscale template matching
+                result_view = self._result_view(roi.shape[0] - template_height + 1,
+                                                roi.shape[1] - template_width + 1, gray_region.shape)
+                result = cv2.matchTemplate(roi, template_gray, cv2.TM_CCOEFF_NORMED, result=result_view)
                 
-                match_info = {
-                    'icon_name': icon_name,
-                    'troop_name': icon_name.replace('field_', ''),  # Remove field_ prefix
-                    'x': actual_x,
-                    'y': actual_y,
-                    'width': int(template_width),
-                    'height': int(template_height),
-                    'center_x': int(actual_x + template_width // 2),
-                    'center_y': int(actual_y + template_height // 2),
-                    'confidence': float(confidence),
-                    'scale': float(scale)
-                }
-                all_matches.append(match_info)
-        
-        # Remove overlapping matches (keep highest confidence)
-        filtered_matches = self.remove_overlapping_detections(all_matches)
-        
-        return filtered_matches
-    
-    def remove_overlapping_detections(self, detections, overlap_threshold=0.5):
-        """Remove overlapping detections, keeping the one with highest confidence"""
-        if not detections:
-            return []
-        
-        # Sort by confidence (highest first)
-        detections = sorted(detections, key=lambda x: x['confidence'], reverse=True)
-        
-        filtered = []
+                # Only local maxima - every correlation peak is a plateau of neighbouring hits
+                peaks = result == cv2.dilate(result, np.ones((3, 3), np.uint8))
+                
+                # Find matches above threshold
+                ys, xs = np.nonzero(peaks & (result >= self.threshold))
+                if len(xs):
+                    box_parts.append(np.column_stack((xs + roi_x0 + offset_x, ys + roi_y0 + offset_y,
+                                                      np.full(len(xs), template_width),
+                                                      np.full(len(xs), template_height))))
+                    score_parts.append(result[ys, xs])
+                    scale_parts.append(np.full(len(xs), scale))
+                
+                # Near misses still seed the in-between scales
+                seed_ys, seed_xs = np.nonzero(peaks & (result >= seed_threshold))
+                if len(seed_xs):
+                    seed_box_parts.append(np.column_stack((seed_xs + roi_x0, seed_ys + roi_y0,
+                                                           np.full(len(seed_xs), template_width),
+                                                           np.full(len(seed_xs), template_height))))
+                    seed_score_parts.append(result[seed_ys, seed_xs])
+        
+        if seed_box_parts:
+            seed_boxes = np.concatenate(seed_box_parts)
+            for seed_index in self._nms_keep(seed_boxes, np.concatenate(seed_score_parts)):
+                for x, y, width, height, confidence, scale in self._refine_seed(gray_region, icon_name,
+                                                                                seed_boxes[seed_index].tolist()):
+                    box_parts.append(np.array([[x + offset_x, y + offset_y, width, height]]))
+                    score_parts.append(np.array([confidence], dtype=np.float32))
+                    scale_parts.append(np.array([scale]))
+        
+        # Overlaps are removed once per frame across all icons (process_board_region)
+        return self._stack_matches(box_parts, score_parts, scale_parts)
+    
+    def _result_view(self, height, width, region_shape):
+        """
+        Get a (height x width) float32 view into this thread's reusable result buffer, so
+        matchTemplate writes in place instead of allocating a new output on every call.
+        Each result is consumed before the thread's next match, so one buffer per thread is enough.
+        """
+        buffer = getattr(self._result_buffers, 'buffer', None)
+        if buffer is None or buffer.shape[0] < height or buffer.shape[1] < width:
+            # Sized for the whole board so ROIs and smaller templates never need a new one
+            buffer = np.empty((max(height, region_shape[0]), max(width, region_shape[1])), dtype=np.float32)
+            self._result_buffers.buffer = buffer
+        return buffer[:height, :width]
+    
+    def _stack_matches(self, box_parts, score_parts, scale_parts):
+        """Join per-scale candidate arrays into single (boxes, scores, scales) arrays"""
+        if not box_parts:
+            return (np.empty((0, 4), dtype=np.int32), np.empty(0, dtype=np.float32),
+                    np.empty(0, dtype=np.float64))
+        return (np.concatenate(box_parts).astype(np.int32), np.concatenate(score_parts).astype(np.float32),
+                np.concatenate(scale_parts).astype(np.float64))
+    
+    def _refine_seed(self, gray_region, icon_name, seed_box):
+        """
+        Check the in-between scales in a small window around one coarse peak.
+        Returns (x, y, width, height, confidence, scale) rows in region coordinates.
+        """
+        refined = []
+        seed_x, seed_y, seed_width, seed_height = seed_box
+        center_x = seed_x + seed_width // 2
+        center_y = seed_y + seed_height // 2
+        
+        for scale in self.refine_scales:
+            if scale not in self._gray_templates[icon_name]:
+                continue
+            
+            template_gray = self._gray_templates[icon_name][scale]
+            template_height, template_width = template_gray.shape[:2]
+            
+            # Window centered on the peak with some slack for the scale change
+            pad = template_width // 8 + 2
+            x0 = max(0, center_x - template_width // 2 - pad)
+            y0 = max(0, center_y - template_height // 2 - pad)
+            x1 = min(gray_region.shape[1], center_x + template_width - template_width // 2 + pad)
+            y1 = min(gray_region.shape[0], center_y + template_height - template_height // 2 + pad)
+            window = gray_region[y0:y1, x0:x1]
+            if window.shape[0] < template_height or window.shape[1] < template_width:
+                continue
+            
+            result = cv2.matchTemplate(window, template_gray, cv2.TM_CCOEFF_NORMED)
+            _, confidence, _, (x, y) = cv2.minMaxLoc(result)
+            
+            if confidence >= self.threshold:
+                refined.append((x + x0, y + y0, template_width, template_height, confidence, scale))
         
-        for detection in detections:
-            overlap_found = False
+        return refined
+    
+    def _build_match(self, icon_name, actual_x, actual_y, template_width, template_height, confidence, scale):
+        """Build the detection dict for a match at screen coordinates (actual_x, actual_y)"""
+        actual_x = int(actual_x)
+        actual_y = int(actual_y)
+        return {
+            'icon_name': icon_name,
+            'troop_name': icon_name.replace('field_', ''),  # Remove field_ prefix
+            'x': actual_x,
+            'y': actual_y,
+            'width': int(template_width),
+            'height': int(template_height),
+            'center_x': int(actual_x + template_width // 2),
+            'center_y': int(actual_y + template_height // 2),
+            'confidence': float(confidence),
+            'scale': float(scale)
+        }
+    
+    def verify_color_matches(self, region_image, matches, offset_x, offset_y):
+        """
+        Confirm grayscale matches against the color templates.
+        Troops that differ mostly by color (e.g. team variants) look alike in grayscale.
+        
+        Args:
+            region_image: Board region in color (BGR)
+            matches (list): Match dicts from find_field_matches
+            offset_x (int): Screen X of the region's left edge
+            offset_y (int): Screen Y of the region's top edge
             
-            for existing in filtered:
-                # Calculate overlap
-                x1 = max(detection['x'], existing['x'])
-                y1 = max(detection['y'], existing['y'])
-                x2 = min(detection['x'] + detection['width'], existing['x'] + existing['width'])
-                y2 = min(detection['y'] + detection['height'], existing['y'] + existing['height'])
-                
-                if x1 < x2 and y1 < y2:
-                    # Calculate overlap area
-                    overlap_area = (x2 - x1) * (y2 - y1)
-                    detection_area = detection['width'] * detection['height']
-                    
-                    overlap_ratio = overlap_area / detection_area
-                    
-                    if overlap_ratio > overlap_threshold:
-                        overlap_found = True
-                        break
+        Returns:
+            Matches that also pass the threshold in color, with their color confidence
+        """
+        verified_matches = []
+        for match in matches:
+            x = match['x'] - offset_x
+            y = match['y'] - offset_y
+            patch = region_image[y:y + match['height'], x:x + match['width']]
+            template_bgr = self.preprocessed_templates[match['icon_name']][match['scale']]
             
-            if not overlap_found:
-                filtered.append(detection)
+            color_confidence = float(cv2.matchTemplate(patch, template_bgr, cv2.TM_CCOEFF_NORMED)[0, 0])
+            if color_confidence >= self.threshold:
+                match['confidence'] = color_confidence
+                verified_matches.append(match)
+        
+        return verified_matches
+    
+    def _nms_keep(self, boxes, scores, overlap_threshold=0.5):
+        """
+        Native NMS over [x, y, width, height] boxes, returning the kept indices (best first).
+        NMSBoxes measures overlap as IoU rather than overlap / box area, so the threshold is
+        converted to the IoU two same-sized boxes have at that overlap ratio.
+        """
+        if len(scores) == 0:
+            return []
         
-        return filtered
+        iou_threshold = overlap_threshold / (2 - overlap_threshold)
+        keep = cv2.dnn.NMSBoxes(np.asarray(boxes).tolist(), np.asarray(scores).tolist(), 0.0, iou_threshold)
+        return np.asarray(keep, dtype=int).reshape(-1).tolist()
     
     def capture_board_state(self):
         """Capture a single board state snapshot"""
+        self.status_var.set("Capturing board state...")
+        
+        # Grab and match in the background so the window stays responsive
+        threading.Thread(target=self._capture_board_state_worker, daemon=True).start()
+    
+    def _capture_board_state_worker(self):
+        """Capture and process one board snapshot, then show it from the main thread"""
+        capture = ScreenCapture()
         try:
-            # Capture screen
-            screenshot = pyautogui.screenshot()
-            screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+            # Capture just the board area
+            left, top, right, bottom = self._board_pixels
+            board_region = capture.grab(left, top, right - left, bottom - top)
             
             # Process board
-            detections = self.process_board_screenshot(screenshot_cv)
+            detections = self.process_board_region(board_region, left, top)
             
-            # Update display with hexagonal board state
-            self.update_board_state_display(detections)
-            
-            self.status_var.set(f"Board state captured! Found {len(detections)} troops in hexagons")
+            self.root.after(0, self._show_board_state, detections)
             
         except Exception as e:
-            self.status_var.set(f"Error capturing board state: {e}")
+            self.root.after(0, self.status_var.set, f"Error capturing board state: {e}")
+        finally:
+            capture.close()
+    
+    def _show_board_state(self, detections):
+        """Display a captured board snapshot (runs in the main thread)"""
+        # Update display with hexagonal board state
+        self.update_board_state_display(detections)
+        
+        self.status_var.set(f"Board state captured! Found {len(detections)} troops in hexagons")
         
     def update_overlay(self, detections):
         """Update the overlay with current detections"""
@@ -737,14 +1080,21 @@ class FieldBoardReader:
         except tk.TclError:
             return
             
-        # Clear previous overlays
+        # Draw board grid
+        self.draw_board_grid()
+        
+        # Same troops in the same places as last frame - leave the canvas items alone
+        overlay_key = tuple((d['x'], d['y'], d['troop_name'], f"{d['confidence']:.2f}") for d in detections)
+        if overlay_key == self._overlay_key:
+            self.update_board_state_display(detections)
+            return
+        
+        # Clear previous detections (the board rectangle is kept and reused)
         try:
-            self.overlay_canvas.delete("all")
+            self.overlay_canvas.delete("detection")
         except tk.TclError:
             return
-        
-        # Draw board grid
-        self.draw_board_grid()
+        self._overlay_key = overlay_key
         
         # Draw detections
         for i, detection in enumerate(detections):
@@ -772,17 +1122,14 @@ class FieldBoardReader:
                 text_x = x + w//2
                 text_y = y - 5
                 
-                # Black outline for text visibility
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        if dx != 0 or dy != 0:
-                            self.overlay_canvas.create_text(text_x + dx, text_y + dy, 
-                                                          text=label, fill='black', font=('Arial', 8, 'bold'),
-                                                          anchor='s', tags="detection")
+                # Black drop shadow for text visibility
+                self.overlay_canvas.create_text(text_x + 1, text_y + 1,
+                                              text=label, fill='black', font=self._label_font,
+                                              anchor='s', tags="detection")
                 
                 # White text on top
                 self.overlay_canvas.create_text(text_x, text_y, 
-                                              text=label, fill='white', font=('Arial', 8, 'bold'),
+                                              text=label, fill='white', font=self._label_font,
                                               anchor='s', tags="detection")
                                               
             except tk.TclError:
@@ -794,13 +1141,19 @@ class FieldBoardReader:
     def draw_board_grid(self):
         """Draw the board area only (no grid since board is not traditional grid)"""
         try:
-            left, top, right, bottom = self.get_board_area_pixels()
+            board_pixels = self._board_pixels
             
-            # Draw main board rectangle only
-            self.overlay_canvas.create_rectangle(
-                left, top, right, bottom,
-                outline='lime', width=3, tags="board_area", fill=''
-            )
+            # Reuse the existing board rectangle and only move it when the board area changed
+            if self.overlay_canvas.find_withtag("board_area"):
+                if board_pixels != self.board_grid_pixels:
+                    self.overlay_canvas.coords("board_area", *board_pixels)
+            else:
+                # Draw main board rectangle only
+                self.overlay_canvas.create_rectangle(
+                    *board_pixels,
+                    outline='lime', width=3, tags="board_area", fill=''
+                )
+            self.board_grid_pixels = board_pixels
             
             self.overlay_canvas.update_idletasks()
             
@@ -809,24 +1162,16 @@ class FieldBoardReader:
     
     def update_board_state_display(self, detections):
         """Update the board state text display with hexagonal organization"""
-        try:
-            self.board_text.delete(1.0, tk.END)
-            
-            if not detections:
-                self.board_text.insert(tk.END, "No troops detected on board\n")
-                return
-            
-            if not self.hexagonal_board:
-                self.board_text.insert(tk.END, "Hexagonal board not initialized\n")
-                return
-            
+        if not detections:
+            text = "No troops detected on board\n"
+        elif not self.hexagonal_board:
+            text = "Hexagonal board not initialized\n"
+        else:
             # Display hexagonal board state
-            board_summary = self.hexagonal_board.get_board_summary()
-            self.board_text.insert(tk.END, board_summary)
-            self.board_text.insert(tk.END, "\n\n")
+            parts = [self.hexagonal_board.get_board_summary(), "\n\n"]
             
             # Display detailed troop information
-            self.board_text.insert(tk.END, "=== DETAILED TROOP INFORMATION ===\n")
+            parts.append("=== DETAILED TROOP INFORMATION ===\n")
             
             for detection in detections:
                 troop_info = get_troop_by_icon_name(detection['troop_name'])
@@ -839,17 +1184,24 @@ class FieldBoardReader:
                 if troop_info:
                     stars = "⭐" * troop_info.stars.value
                     traits = ", ".join([trait.name for trait in troop_info.traits[:2]])
-                    text = f"{troop_info.name} {stars} ({troop_info.cost}💧){hex_info}\n"
-                    text += f"  Traits: {traits}\n"
-                    text += f"  Confidence: {detection['confidence']:.3f}\n"
-                    text += f"  Position: ({detection['center_x']}, {detection['center_y']})\n\n"
+                    parts.append(f"{troop_info.name} {stars} ({troop_info.cost}💧){hex_info}\n")
+                    parts.append(f"  Traits: {traits}\n")
                 else:
-                    text = f"{detection['troop_name']}{hex_info}\n"
-                    text += f"  Confidence: {detection['confidence']:.3f}\n"
-                    text += f"  Position: ({detection['center_x']}, {detection['center_y']})\n\n"
-                
-                self.board_text.insert(tk.END, text)
-                
+                    parts.append(f"{detection['troop_name']}{hex_info}\n")
+                parts.append(f"  Confidence: {detection['confidence']:.3f}\n")
+                parts.append(f"  Position: ({detection['center_x']}, {detection['center_y']})\n\n")
+            
+            text = "".join(parts)
+        
+        # Nothing changed since the last frame - skip the widget update
+        if text == self._board_text_shown:
+            return
+        
+        try:
+            # One delete and one insert, so the widget lays out once per update
+            self.board_text.delete(1.0, tk.END)
+            self.board_text.insert(tk.END, text)
+            self._board_text_shown = text
         except tk.TclError:
             pass
             
@@ -865,6 +1217,7 @@ class FieldBoardReader:
         
         # Wait a moment for threads to finish
         time.sleep(0.1)
+        self._pool.shutdown(wait=False)
         
         # Destroy overlay window safely
         try:
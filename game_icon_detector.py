@@ -13,9 +13,43 @@ import cv2
 import numpy as np
 import os
 import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime
 
+# Optional fast JSON encoder for the results file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Progress goes through logging so per-icon lines cost nothing unless asked for:
+# INFO shows saved images and the final summary, DEBUG adds every icon and match
+logger = logging.getLogger(__name__)
+
+# Matches are kept as rows of a structured array and only become dicts when written to JSON.
+# Field names match the JSON keys
+MATCH_DT = np.dtype([('x', 'i4'), ('y', 'i4'), ('width', 'i4'), ('height', 'i4'),
+                     ('center_x', 'i4'), ('center_y', 'i4'), ('confidence', 'f4'), ('scale', 'f8')])
+
+_build_info_logged = False
+
+
+def _log_opencv_build():
+    """Log (once per process, at DEBUG) whether this OpenCV build has IPP and which thread backend it uses"""
+    global _build_info_logged
+    if _build_info_logged:
+        return
+    _build_info_logged = True
+    
+    for line in cv2.getBuildInformation().splitlines():
+        line = line.strip()
+        if line.startswith(('Intel IPP:', 'Parallel framework:')):
+            logger.debug("OpenCV %s", ' '.join(line.split()))
+    logger.debug("OpenCV optimized: %s, threads: %d", cv2.useOptimized(), cv2.getNumThreads())
+
 class GameIconDetector:
     def __init__(self, icons_dir="market_icons", screenshots_dir="test_game_screenshots", 
                  output_dir="highlighted_screenshots", threshold=0.6, search_bottom_fraction=0.25,
@@ -39,7 +73,29 @@ class GameIconDetector:
         self.search_bottom_fraction = search_bottom_fraction
         self.ignore_top_right_fraction = ignore_top_right_fraction
         self.use_preprocessing = use_preprocessing
-        self.results = []
+        # Per-screenshot results are streamed to detection_results.jsonl - only the totals stay in memory
+        self.total_screenshots = 0
+        self.total_matches = 0
+        
+        # Coarse-to-fine search: match on the image shrunk by 2**pyramid_levels first, then
+        # only search full resolution around coarse hits scoring above threshold - coarse_margin
+        self.pyramid_levels = 2
+        self.coarse_margin = 0.1
+        
+        # Opt-in OpenCL (T-API) matching for full-region searches. Off by default - after the
+        # coarse pass most matches run on small windows, where the GPU upload costs more than it saves
+        self.use_opencl = False
+        
+        # Make sure OpenCV's SIMD/IPP code paths are on - it's the default, but it's a process-wide
+        # switch that other libraries can turn off. Thread counts are set around the icon pool instead
+        # (one OpenCV thread per worker while it runs, OpenCV's default otherwise)
+        cv2.setUseOptimized(True)
+        _log_opencv_build()
+        
+        # Templates are loaded and preprocessed once, then reused for every screenshot
+        self._template_cache = {}  # {icon path: (file mtime, (template_bgr, template_gray) or None)}
+        self._scaled_template_cache = {}  # {(icon path, search shape, scale range): [(scale, template_scaled)]}
+        self._result_buffers = threading.local()  # One reusable matchTemplate output per worker thread
         
         # Create output directory if it doesn't exist
         self.output_dir.mkdir(exist_ok=True)
@@ -81,53 +137,68 @@ class GameIconDetector:
         
         return (min_scale, max_scale)
     
-    def find_matches_multiscale(self, main_image, template_image, scale_range=(0.1, 2.0), scale_steps=15):
+    def load_template(self, icon_file):
         """
-        Find template matches using multi-scale template matching.
-        
-        Args:
-            main_image: The main screenshot image (BGR format)
-            template_image: The template/icon to search for (BGR format)
-            scale_range: Tuple of (min_scale, max_scale) to try
-            scale_steps: Number of scale levels to test (reduced for speed)
+        Load an icon template and its preprocessed grayscale version, cached by path.
+        The file is only decoded again if its modification time changes.
         
         Returns:
-            List of dictionaries containing match information
+            Tuple of (template_bgr, template_gray), or None if the file can't be read
         """
-        # Calculate search region (bottom fraction of the image)
-        image_height = main_image.shape[0]
-        search_start_y = int(image_height * (1 - self.search_bottom_fraction))
-        
-        # Crop image to search region only
-        search_region = main_image[search_start_y:, :]
-        
-        # Get adaptive scale range based on template and search region sizes
-        if scale_range == (0.1, 2.0):  # Use default adaptive scaling
-            scale_range = self.get_adaptive_scale_range(template_image, search_region)
-        
-    # Logging suppressed: only show near matches
-        
-        # Convert main image to grayscale once (outside loop for speed)
-        main_gray = cv2.cvtColor(search_region, cv2.COLOR_BGR2GRAY)
+        key = str(icon_file)
+        try:
+            mtime = os.path.getmtime(key)
+        except OSError:
+            mtime = None
+        
+        cached = self._template_cache.get(key)
+        if cached is None or cached[0] != mtime:
+            # Unreadable files are cached as None too, so they aren't retried for every screenshot
+            template_image = cv2.imread(key)
+            template = None
+            if template_image is not None:
+                template = (template_image, self._preprocess_template(template_image))
+            
+            # Resized versions of an edited icon are stale as well
+            if cached is not None:
+                for scaled_key in [k for k in list(self._scaled_template_cache) if k[0] == key]:
+                    self._scaled_template_cache.pop(scaled_key, None)
+            
+            cached = self._template_cache[key] = (mtime, template)
+        return cached[1]
+    
+    def _preprocess_template(self, template_image):
+        """Convert a template to grayscale (equalized if preprocessing is on)"""
         template_gray = cv2.cvtColor(template_image, cv2.COLOR_BGR2GRAY)
         
-        # Normalize both images to handle grayed-out/unaffordable icons
+        # Normalize to handle grayed-out/unaffordable icons
         if self.use_preprocessing:
-            # Apply histogram equalization to improve matching between normal and grayed icons
-            main_gray = cv2.equalizeHist(main_gray)
             template_gray = cv2.equalizeHist(template_gray)
         
-        # Alternative: normalize brightness and contrast
-        # main_gray = cv2.normalize(main_gray, None, 0, 255, cv2.NORM_MINMAX)
-        # template_gray = cv2.normalize(template_gray, None, 0, 255, cv2.NORM_MINMAX)
+        return template_gray
+    
+    def get_scaled_templates(self, template_gray, search_shape, scale_range, cache_key=None):
+        """
+        Build the resized (and masked) templates for every scale that fits the search region.
+        
+        Args:
+            template_gray: Preprocessed grayscale template
+            search_shape: Shape of the search region
+            scale_range: Tuple of (min_scale, max_scale)
+            cache_key: Optional key (e.g. icon path) to reuse the result across screenshots
+        
+        Returns:
+            List of (scale, template_scaled, template_mask) tuples in increasing scale order -
+            template_mask is None unless ignore_top_right_fraction is set
+        """
+        if cache_key is not None:
+            full_key = (cache_key, search_shape[:2], scale_range)
+            if full_key in self._scaled_template_cache:
+                return self._scaled_template_cache[full_key]
         
         # Get original template dimensions
         template_height, template_width = template_gray.shape
         
-        all_matches = []
-        best_confidence = 0
-        found_good_match = False  # Track if we found a good match early
-        
         # Generate scale factors - use more fine-grained scaling for better detection
         min_scale, max_scale = scale_range
         # Reduce scale steps for speed - fewer steps but still good coverage
@@ -136,6 +207,7 @@ class GameIconDetector:
         scales = np.unique(np.concatenate([scales_coarse, scales_fine]))
         scales = np.sort(scales)
         
+        scaled_templates = []
         for scale in scales:
             # Calculate new dimensions
             new_width = int(template_width * scale)
@@ -144,134 +216,287 @@ class GameIconDetector:
             # Skip if template becomes too small or too large
             if new_width < 8 or new_height < 8:  # Allow smaller icons
                 continue
-            if new_width > search_region.shape[1] * 0.8 or new_height > search_region.shape[0] * 0.8:  # Allow larger but not overwhelming
+            if new_width > search_shape[1] * 0.8 or new_height > search_shape[0] * 0.8:  # Allow larger but not overwhelming
                 continue
             
-            # Resize template
-            template_scaled = cv2.resize(template_gray, (new_width, new_height))
+            # Resize template - area averaging when shrinking avoids aliasing that shows up as false peaks
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_LINEAR
+            template_scaled = cv2.resize(template_gray, (new_width, new_height), interpolation=interpolation)
             
             # Mask out top-right corner of template if specified
+            template_mask = None
             if self.ignore_top_right_fraction > 0:
                 th, tw = template_scaled.shape
                 mask_h = int(th * self.ignore_top_right_fraction)
                 mask_w = int(tw * self.ignore_top_right_fraction)
-                # Zero out top-right region to ignore obstructed parts
-                template_scaled[0:mask_h, tw-mask_w:tw] = 0
+                # matchTemplate skips masked pixels entirely - zeroing them instead would still
+                # count them in the template mean/variance and drag every score down
+                template_mask = np.ones_like(template_scaled)
+                template_mask[0:mask_h, tw-mask_w:tw] = 0
+            
+            scaled_templates.append((scale, template_scaled, template_mask))
+        
+        if cache_key is not None:
+            self._scaled_template_cache[full_key] = scaled_templates
+        
+        return scaled_templates
+    
+    def _match(self, image, template, template_mask=None, result=None):
+        """TM_CCOEFF_NORMED match, leaving out the template's masked pixels if it has a mask"""
+        if template_mask is None:
+            return cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=result)
+        
+        result = cv2.matchTemplate(image, template, cv2.TM_CCOEFF_NORMED, result=result, mask=template_mask)
+        return self._clean_masked_result(result)
+    
+    def _clean_masked_result(self, result):
+        """Flat windows divide by zero under a mask - count them as no match (result must be a numpy array)"""
+        return np.nan_to_num(result, copy=False, nan=0.0, posinf=0.0, neginf=0.0)
+    
+    def _match_full_region(self, main_gray, template_scaled, template_mask=None):
+        """Match a template over the whole search region, through OpenCL if enabled and available"""
+        if self.use_opencl and cv2.ocl.haveOpenCL():
+            if template_mask is None:
+                return cv2.matchTemplate(cv2.UMat(main_gray), cv2.UMat(template_scaled),
+                                         cv2.TM_CCOEFF_NORMED).get()
+            # nan_to_num can't see into a UMat, so clean up after copying the result back
+            result = cv2.matchTemplate(cv2.UMat(main_gray), cv2.UMat(template_scaled), cv2.TM_CCOEFF_NORMED,
+                                       mask=cv2.UMat(template_mask))
+            return self._clean_masked_result(result.get())
+        result = self._result_view(main_gray.shape[0] - template_scaled.shape[0] + 1,
+                                   main_gray.shape[1] - template_scaled.shape[1] + 1, main_gray.shape)
+        return self._match(main_gray, template_scaled, template_mask, result)
+    
+    def _result_view(self, height, width, region_shape):
+        """
+        Get a (height x width) float32 view into this thread's reusable result buffer, so
+        matchTemplate writes in place instead of allocating a new output on every call.
+        Only the coarse map and full-region maps use it - each is consumed before the
+        thread's next match. The small per-ROI maps are allocated as usual.
+        """
+        buffer = getattr(self._result_buffers, 'buffer', None)
+        if buffer is None or buffer.shape[0] < height or buffer.shape[1] < width:
+            # Sized for the whole search region so every template fits
+            buffer = np.empty((max(height, region_shape[0]), max(width, region_shape[1])), dtype=np.float32)
+            self._result_buffers.buffer = buffer
+        return buffer[:height, :width]
+    
+    def _coarse_to_fine_match(self, main_gray, main_small, template_scaled, template_mask=None):
+        """
+        Match one scaled template on the shrunk image first, then at full resolution only
+        around the coarse hits. Templates too small to shrink are matched everywhere.
+        
+        Args:
+            main_gray: Preprocessed grayscale search region
+            main_small: main_gray after pyramid_levels pyrDowns
+            template_scaled: Scaled template to match
+            template_mask: Optional mask of the template pixels to compare
+        
+        Returns:
+            Tuple of (pieces, coarse_peak) - pieces is a list of (result, x0, y0) correlation
+            maps with their offsets in main_gray, coarse_peak the (value, (x, y)) of the coarse
+            map's peak in main_small coordinates (None if the coarse pass was skipped)
+        """
+        template_height, template_width = template_scaled.shape
+        template_small = template_scaled
+        for _ in range(self.pyramid_levels):
+            template_small = cv2.pyrDown(template_small)
+        
+        if (min(template_small.shape) < 8 or template_small.shape[0] > main_small.shape[0]
+                or template_small.shape[1] > main_small.shape[1]):
+            return [(self._match_full_region(main_gray, template_scaled, template_mask), 0, 0)], None
+        
+        mask_small = None
+        if template_mask is not None:
+            mask_small = cv2.resize(template_mask, template_small.shape[::-1], interpolation=cv2.INTER_NEAREST)
+        
+        coarse = self._result_view(main_small.shape[0] - template_small.shape[0] + 1,
+                                   main_small.shape[1] - template_small.shape[1] + 1, main_gray.shape)
+        coarse = self._match(main_small, template_small, mask_small, coarse)
+        _, coarse_max, _, coarse_loc = cv2.minMaxLoc(coarse)
+        coarse_peak = (coarse_max, coarse_loc)
+        if coarse_max < self.threshold - self.coarse_margin:
+            return [], coarse_peak
+        
+        # Merge neighbouring coarse hits so each candidate icon gets one window
+        mask = (coarse >= self.threshold - self.coarse_margin).astype(np.uint8)
+        mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((3, 3), np.uint8))
+        contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        
+        pieces = []
+        for contour in contours:
+            piece = self._refine_window(main_gray, template_scaled, template_mask, *cv2.boundingRect(contour))
+            if piece is not None:
+                pieces.append(piece)
+        
+        return pieces, coarse_peak
+    
+    def _refine_window(self, main_gray, template_scaled, template_mask, x, y, w, h):
+        """
+        Full-resolution match in the window around a (x, y, w, h) rectangle of coarse hits.
+        
+        Returns:
+            (result, x0, y0) with the window's offset in main_gray, or None if the template doesn't fit
+        """
+        template_height, template_width = template_scaled.shape
+        factor = 2 ** self.pyramid_levels
+        x0 = max(0, (x - 1) * factor)
+        y0 = max(0, (y - 1) * factor)
+        x1 = min(main_gray.shape[1], (x + w + 1) * factor + template_width)
+        y1 = min(main_gray.shape[0], (y + h + 1) * factor + template_height)
+        roi = main_gray[y0:y1, x0:x1]
+        if roi.shape[0] < template_height or roi.shape[1] < template_width:
+            return None
+        return self._match(roi, template_scaled, template_mask), x0, y0
+    
+    def prepare_search_region(self, main_image):
+        """
+        Crop a screenshot to the search region and preprocess it for matching.
+        Done once per screenshot - the result is shared by every template search.
+        
+        Args:
+            main_image: The main screenshot image (BGR format)
+        
+        Returns:
+            Tuple of (main_gray, main_small, search_start_y) - the preprocessed grayscale search
+            region, its pyramid_levels-shrunk copy for the coarse pass, and the region's top edge
+        """
+        # Calculate search region (bottom fraction of the image)
+        image_height = main_image.shape[0]
+        search_start_y = int(image_height * (1 - self.search_bottom_fraction))
+        
+        # Crop image to search region only
+        search_region = main_image[search_start_y:, :]
+        
+        main_gray = cv2.cvtColor(search_region, cv2.COLOR_BGR2GRAY)
+        
+        # Normalize to handle grayed-out/unaffordable icons
+        if self.use_preprocessing:
+            # Apply histogram equalization to improve matching between normal and grayed icons
+            main_gray = cv2.equalizeHist(main_gray)
+        
+        # Alternative: normalize brightness and contrast
+        # main_gray = cv2.normalize(main_gray, None, 0, 255, cv2.NORM_MINMAX)
+        
+        # Shrunk copy for the coarse pass
+        main_small = main_gray
+        for _ in range(self.pyramid_levels):
+            main_small = cv2.pyrDown(main_small)
+        
+        return main_gray, main_small, search_start_y
+    
+    def find_matches_multiscale(self, main_gray, search_start_y, template_image, scale_range=(0.1, 2.0),
+                                scale_steps=15, template_key=None, main_small=None, template_gray=None):
+        """
+        Find template matches using multi-scale template matching.
+        
+        Args:
+            main_gray: Preprocessed grayscale search region (see prepare_search_region)
+            search_start_y (int): Top edge of the search region in the screenshot
+            template_image: The template/icon to search for (BGR format)
+            scale_range: Tuple of (min_scale, max_scale) to try
+            scale_steps: Number of scale levels to test (reduced for speed)
+            template_key: Icon path of a template loaded with load_template, so its resized
+                          versions come from the cache instead of being rebuilt
+            main_small: Shrunk main_gray from prepare_search_region (built here if not given)
+            template_gray: Preprocessed template from load_template (built here if not given)
+        
+        Returns:
+            Tuple of (matches, best_confidence) - matches is a MATCH_DT array holding the best
+            match, or empty if nothing passed the threshold
+        """
+        # Get adaptive scale range based on template and search region sizes
+        if scale_range == (0.1, 2.0):  # Use default adaptive scaling
+            scale_range = self.get_adaptive_scale_range(template_image, main_gray)
+        
+    # Logging suppressed: only show near matches
+        
+        if main_small is None:
+            main_small = main_gray
+            for _ in range(self.pyramid_levels):
+                main_small = cv2.pyrDown(main_small)
+        
+        if template_gray is None:
+            template_gray = self._preprocess_template(template_image)
+        
+        best_match = None  # (x, y, width, height, confidence, scale) of the best match so far
+        best_confidence = 0
+        found_good_match = False  # Track if we found a good match early
+        
+        scaled_templates = self.get_scaled_templates(template_gray, main_gray.shape, scale_range,
+                                                     cache_key=template_key)
+        
+        refined_any = False
+        best_coarse = None  # (coarse value, coarse location, template, mask) of the best skipped scale
+        
+        for scale, template_scaled, template_mask in scaled_templates:
+            new_height, new_width = template_scaled.shape
             
-            # Perform template matching on the cropped region
-            result = cv2.matchTemplate(main_gray, template_scaled, cv2.TM_CCOEFF_NORMED)
+            # Perform template matching on the cropped region, coarse-to-fine
+            pieces, coarse_peak = self._coarse_to_fine_match(main_gray, main_small, template_scaled, template_mask)
+            
+            # Nothing worth refining at this scale - remember the coarse peak for best_confidence
+            if not pieces:
+                if coarse_peak is not None and (best_coarse is None or coarse_peak[0] > best_coarse[0]):
+                    best_coarse = (coarse_peak[0], coarse_peak[1], template_scaled, template_mask)
+                continue
+            refined_any = True
             
             # Find the best match for this scale
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
+            max_val, max_loc = None, None
+            for result, x0, y0 in pieces:
+                _, piece_max, _, (x, y) = cv2.minMaxLoc(result)
+                if max_loc is None or piece_max > max_val:
+                    max_val, max_loc = piece_max, (x + x0, y + y0)
             
             if max_val > best_confidence:
                 best_confidence = max_val
             
-            # Early exit optimization: if we found good matches, reduce remaining scales
-            if best_confidence >= self.threshold and len(all_matches) >= 1:
+            # Early exit optimization: if we found good matches, we can stop
+            if best_confidence >= self.threshold and best_match is not None:
                 # For single icon detection, if we found a good match, we can exit early
                 if best_confidence > self.threshold * 1.2:  # Very confident match
                     break
-                # Skip some remaining scales for speed once we have good matches
-                remaining_scales = scales[scales > scale]
-                if len(remaining_scales) > 3:
-                    scales = np.concatenate([scales[scales <= scale], remaining_scales[::2]])
             
-            # Find all matches above threshold for this scale
-            if max_val >= self.threshold:
-                locations = np.where(result >= self.threshold)
-                
-                for pt in zip(*locations[::-1]):  # Switch x and y coordinates
-                    x, y = pt
-                    confidence = result[y, x]
-                    
-                    # Adjust coordinates to account for the cropped search region
-                    actual_x = int(x)
-                    actual_y = int(y + search_start_y)  # Add offset for cropped region
-                    
-                    match_info = {
-                        'x': actual_x,
-                        'y': actual_y,
-                        'width': int(new_width),
-                        'height': int(new_height),
-                        'center_x': int(actual_x + new_width // 2),
-                        'center_y': int(actual_y + new_height // 2),
-                        'confidence': float(confidence),
-                        'scale': float(scale)
-                    }
-                    all_matches.append(match_info)
-        
-        # Remove overlapping matches - limit to 1 per icon since each can only appear once
-        filtered_matches = self._remove_overlapping_matches(all_matches)
-        
-        # For single icon detection, return only the best match
-        if filtered_matches:
-            best_match = max(filtered_matches, key=lambda x: x['confidence'])
-            return [best_match], best_confidence
-        
-        return filtered_matches, best_confidence
+            # Each icon appears at most once, so only the strongest peak over all scales matters -
+            # no need to collect every peak and run overlap suppression on them
+            if max_val >= self.threshold and (best_match is None or max_val > best_match[4]):
+                best_match = (max_loc[0], max_loc[1], new_width, new_height, max_val, scale)
+        
+        # No scale got past the coarse pass. The quarter-size peak reads higher than a real score,
+        # so re-measure it at full resolution - that's what best_confidence reports for near misses
+        if not refined_any and best_coarse is not None:
+            _, (coarse_x, coarse_y), template_scaled, template_mask = best_coarse
+            piece = self._refine_window(main_gray, template_scaled, template_mask, coarse_x, coarse_y, 1, 1)
+            if piece is not None:
+                best_confidence = max(best_confidence, float(piece[0].max()))
+        
+        matches = np.empty(1 if best_match else 0, dtype=MATCH_DT)
+        if best_match:
+            x, y, width, height, confidence, scale = best_match
+            y += search_start_y  # Add offset for cropped region
+            matches[0] = (x, y, width, height, x + width // 2, y + height // 2, confidence, scale)
+        return matches, best_confidence
     
-    def _remove_overlapping_matches(self, matches, overlap_threshold=0.2):
-        """Remove overlapping matches, keeping the highest confidence ones."""
-        if not matches:
-            return matches
-        
-        # Sort matches by confidence (highest first)
-        matches = sorted(matches, key=lambda x: x['confidence'], reverse=True)
-        
-        filtered_matches = []
-        for current_match in matches:
-            x1, y1 = current_match['x'], current_match['y']
-            w1, h1 = current_match['width'], current_match['height']
-            
-            # Check if this match overlaps significantly with any existing match
-            overlaps = False
-            for existing_match in filtered_matches:
-                x2, y2 = existing_match['x'], existing_match['y']
-                w2, h2 = existing_match['width'], existing_match['height']
-                
-                # Calculate intersection area
-                ix1 = max(x1, x2)
-                iy1 = max(y1, y2)
-                ix2 = min(x1 + w1, x2 + w2)
-                iy2 = min(y1 + h1, y2 + h2)
-                
-                if ix1 < ix2 and iy1 < iy2:
-                    intersection_area = (ix2 - ix1) * (iy2 - iy1)
-                    smaller_area = min(w1 * h1, w2 * h2)
-                    
-                    if intersection_area / smaller_area > overlap_threshold:
-                        overlaps = True
-                        break
-            
-            if not overlaps:
-                filtered_matches.append(current_match)
-        
-        return filtered_matches
+    def matches_to_dicts(self, matches):
+        """Convert a MATCH_DT array to a list of plain dicts (for JSON output)"""
+        return [dict(zip(MATCH_DT.names, row)) for row in matches.tolist()]
     
-    def highlight_matches(self, image, matches, color=(0, 255, 0), thickness=3, icon_name=""):
-        """Draw rectangles and labels around found matches."""
-        highlighted_image = image.copy()
-        
-        for i, match in enumerate(matches):
-            x, y, w, h = match['x'], match['y'], match['width'], match['height']
-            confidence = match['confidence']
-            
+    def draw_matches_inplace(self, image, matches, color=(0, 255, 0), thickness=3, icon_name=""):
+        """Draw rectangles and labels around found matches (a MATCH_DT array) directly onto image."""
+        for x, y, w, h, center_x, center_y, confidence, _ in matches.tolist():
             # Draw rectangle around the match
-            cv2.rectangle(highlighted_image, (x, y), (x + w, y + h), color, thickness)
+            cv2.rectangle(image, (x, y), (x + w, y + h), color, thickness)
             
             # Add center point
-            center_x, center_y = match['center_x'], match['center_y']
-            cv2.circle(highlighted_image, (center_x, center_y), 8, (0, 0, 255), -1)
+            cv2.circle(image, (center_x, center_y), 8, (0, 0, 255), -1)
             
             # Add icon name and confidence
             label = f"{icon_name}: {confidence:.2f}"
-            cv2.putText(highlighted_image, label, 
+            cv2.putText(image, label, 
                        (x + 5, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 2)
-            cv2.putText(highlighted_image, label, 
+            cv2.putText(image, label, 
                        (x + 5, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1)
-        
-        return highlighted_image
     
     def process_all_screenshots(self):
         """Process all screenshots and detect icons."""
@@ -285,10 +510,52 @@ class GameIconDetector:
         if not screenshot_files:
             return
         
-        # Process each screenshot
-        for screenshot_file in screenshot_files:
-            # Load the screenshot
-            main_image = cv2.imread(str(screenshot_file))
+        # Icons are searched in parallel (matchTemplate releases the GIL) - keep OpenCV's own
+        # threading out of the way while the pool runs
+        previous_threads = cv2.getNumThreads()
+        cv2.setNumThreads(1)
+        results_file = self.output_dir / "detection_results.jsonl"
+        try:
+            with open(results_file, 'wb') as results_out:
+                with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                    self._process_screenshots(screenshot_files, icon_files, pool, results_out)
+                if self.total_matches > 0:
+                    self.save_results(results_out)
+        finally:
+            cv2.setNumThreads(previous_threads)
+        
+        # Keep the JSON results only if matches were found
+        if self.total_matches > 0:
+            logger.info("Processing complete! Results saved to detection_results.jsonl")
+        else:
+            results_file.unlink()
+            logger.info("Processing complete! No matches found, skipping JSON save.")
+    
+    def _search_icon(self, search, icon_file, template):
+        """Search one prepared search region for one icon (template is its load_template result) -
+        returns (matches, best_confidence)"""
+        main_gray, main_small, search_start_y = search
+        template_bgr, template_gray = template
+        return self.find_matches_multiscale(main_gray, search_start_y, template_bgr, template_key=str(icon_file),
+                                            main_small=main_small, template_gray=template_gray)
+    
+    def _prefetch_screenshots(self, screenshot_files):
+        """Yield (screenshot_file, image) pairs, decoding the next screenshot on a background thread"""
+        with ThreadPoolExecutor(max_workers=1) as loader:
+            pending = loader.submit(cv2.imread, str(screenshot_files[0])) if screenshot_files else None
+            for idx, screenshot_file in enumerate(screenshot_files):
+                main_image = pending.result()
+                if idx + 1 < len(screenshot_files):
+                    pending = loader.submit(cv2.imread, str(screenshot_files[idx + 1]))
+                yield screenshot_file, main_image
+    
+    def _process_screenshots(self, screenshot_files, icon_files, pool, results_out):
+        """Detect icons in every screenshot, running the per-icon searches on the pool and
+        writing each screenshot's result to results_out as soon as it's done"""
+        priority_names = ['pekka', 'mega_knight', 'knight', 'archer', 'goblin', 'skeleton_king']
+        
+        # Process each screenshot (the next one is decoded while this one is searched)
+        for screenshot_file, main_image in self._prefetch_screenshots(screenshot_files):
             if main_image is None:
                 continue
             screenshot_result = {
@@ -297,52 +564,76 @@ class GameIconDetector:
                 'image_size': {'width': main_image.shape[1], 'height': main_image.shape[0]},
                 'icons_detected': []
             }
-            highlighted_image = main_image.copy()
+            # Grayscale/equalize/pyramid the search region once for all templates
+            search = self.prepare_search_region(main_image)
+            
+            # Templates are looked up here, once per screenshot - the workers only get the arrays,
+            # so the template caches are never touched from the pool
+            templates = {icon_file: self.load_template(icon_file) for icon_file in icon_files}
+            
+            # The searches only read the preprocessed copy, so matches are drawn straight onto the screenshot
+            highlighted_image = main_image
             total_matches = 0
             colors = [(0, 255, 0), (255, 0, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
             found_icons = set()  # Track which icons we've already found
             
+            # Priority icons are always searched, so start them all at once; the rest are only
+            # started if the priority icons didn't already fill the 3 slots
+            futures = {icon_file: pool.submit(self._search_icon, search, icon_file, templates[icon_file])
+                       for icon_file in icon_files
+                       if icon_file.stem in priority_names and templates[icon_file] is not None}
+            
             for icon_idx, icon_file in enumerate(icon_files):
                 # Early exit: stop if we've found 3 icons (max per picture)
                 # But ensure we process all priority icons first
                 if total_matches >= 3:
-                    priority_names = ['pekka', 'mega_knight', 'knight', 'archer', 'goblin', 'skeleton_king']
                     if icon_file.stem not in priority_names:
-                        print(f"✓ Found maximum 3 icons, skipping non-priority templates")
+                        logger.debug("✓ Found maximum 3 icons, skipping non-priority templates")
                         break
+                
+                # Unreadable icon files are skipped
+                template = templates[icon_file]
+                if template is None:
+                    continue
+                
+                if icon_file not in futures:
+                    for remaining_file in icon_files[icon_idx:]:
+                        if remaining_file not in futures and templates[remaining_file] is not None:
+                            futures[remaining_file] = pool.submit(self._search_icon, search, remaining_file,
+                                                                  templates[remaining_file])
                     
                 icon_name = icon_file.stem
-                # Load the template
-                template_image = cv2.imread(str(icon_file))
-                if template_image is None:
-                    continue
-                matches, best_confidence = self.find_matches_multiscale(main_image, template_image)
+                # Collect the search results in the original icon order
+                template_image = template[0]
+                matches, best_confidence = futures[icon_file].result()
                 
                 # Only create detailed JSON object if matches were found (speed optimization)
-                if matches:
+                if len(matches):
                     found_icons.add(icon_name)  # Mark this icon as found
                     icon_result = {
                         'icon_name': icon_name,
                         'template_size': {'width': template_image.shape[1], 'height': template_image.shape[0]},
                         'best_confidence': float(best_confidence),
                         'matches_found': len(matches),
-                        'matches': matches
+                        'matches': self.matches_to_dicts(matches)
                     }
-                    print(f"✓ {icon_name}: {len(matches)} match(es)")
-                    for i, match in enumerate(matches):
-                        print(f"  Match {i+1}: Center ({match['center_x']}, {match['center_y']}), Size {match['width']}x{match['height']}, Confidence {match['confidence']:.3f}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("✓ %s: %d match(es)", icon_name, len(matches))
+                        for i, match in enumerate(matches):
+                            logger.debug("  Match %d: Center (%d, %d), Size %dx%d, Confidence %.3f", i + 1,
+                                         match['center_x'], match['center_y'], match['width'], match['height'],
+                                         match['confidence'])
                     color = colors[icon_idx % len(colors)]
-                    highlighted_image = self.highlight_matches(highlighted_image, matches, color, icon_name=icon_name)
+                    self.draw_matches_inplace(highlighted_image, matches, color, icon_name=icon_name)
                     total_matches += len(matches)
                     screenshot_result['icons_detected'].append(icon_result)
                 else:
                     # Always record results for priority icons or when we have < 3 matches
-                    priority_names = ['pekka', 'mega_knight', 'knight', 'archer', 'goblin', 'skeleton_king']
                     should_record = (icon_name in priority_names or 
                                    total_matches < 3 or 
                                    best_confidence > self.threshold * 0.7)
                     
-                    print(f"✗ {icon_name}: No matches (best: {best_confidence:.3f})")
+                    logger.debug("✗ %s: No matches (best: %.3f)", icon_name, best_confidence)
                     
                     if should_record:
                         screenshot_result['icons_detected'].append({
@@ -353,42 +644,46 @@ class GameIconDetector:
             if total_matches > 0:
                 output_filename = f"detected_{screenshot_file.name}"
                 output_path = self.output_dir / output_filename
-                cv2.imwrite(str(output_path), highlighted_image)
-                print(f"→ Saved highlighted image: {output_filename}")
+                # Fast deflate level - these are debug images, so size matters less than encode time
+                cv2.imwrite(str(output_path), highlighted_image, [cv2.IMWRITE_PNG_COMPRESSION, 1])
+                logger.info("→ Saved highlighted image: %s", output_filename)
                 screenshot_result['highlighted_image'] = output_filename
             else:
                 screenshot_result['highlighted_image'] = None
             screenshot_result['total_matches'] = total_matches
-            self.results.append(screenshot_result)
-        
-        # Save JSON results only if matches were found (speed optimization)
-        if any(r['total_matches'] > 0 for r in self.results):
-            self.save_results()
-            print(f"\nProcessing complete! Results saved to detection_results.json")
-        else:
-            print(f"\nProcessing complete! No matches found, skipping JSON save.")
+            results_out.write(self._json_line(screenshot_result))
+            self.total_screenshots += 1
+            self.total_matches += total_matches
+            
+            # Searches started for icons past the early exit aren't needed anymore. Wait out the
+            # ones already running, so none is still busy when the next screenshot reloads templates
+            for future in futures.values():
+                future.cancel()
+            wait(futures.values())
     
-    def save_results(self):
-        """Save detection results to JSON file."""
-        results_file = self.output_dir / "detection_results.json"
-        
+    def _json_line(self, record):
+        """Encode one record as a line of JSON"""
+        if orjson is not None:
+            # Everything in the results is already a plain int/float/str, which orjson requires
+            return orjson.dumps(record) + b'\n'
+        return (json.dumps(record) + '\n').encode()
+    
+    def save_results(self, results_out):
+        """Append the run summary as the last line of the JSONL results file."""
         summary = {
             'detection_summary': {
                 'timestamp': datetime.now().isoformat(),
-                'total_screenshots': len(self.results),
-                'total_matches': sum(r['total_matches'] for r in self.results),
+                'total_screenshots': self.total_screenshots,
+                'total_matches': self.total_matches,
                 'threshold_used': self.threshold
-            },
-            'results': self.results
+            }
         }
-        
-        with open(results_file, 'w') as f:
-            json.dump(summary, f, indent=2)
-        
-    # Logging suppressed
+        results_out.write(self._json_line(summary))
 
 def main():
     """Main function to run the icon detector."""
+    # Saved images and the summary; use level=logging.DEBUG to see every icon
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     try:
         detector = GameIconDetector(
             threshold=0.75,
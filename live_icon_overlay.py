@@ -4,12 +4,15 @@ Live Icon Overlay for real-time game icon detection.
 
 import cv2
 import numpy as np
-import pyautogui
 import tkinter as tk
 from tkinter import ttk
+import os
+import queue
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from game_icon_detector import GameIconDetector
+from screen_capture import ScreenCapture, FrameGrabber, sleep_until_next_frame
 from pathlib import Path
 from troop_definitions import TROOP_REGISTRY, get_troop_by_icon_name
 
@@ -29,7 +32,18 @@ class LiveIconOverlay:
         
         # Preprocessed template cache for speed optimization
         self.preprocessed_templates = {}
+        self.template_pyramids = {}  # {icon: {scale: [template, pyrDown'd once, twice...]}}
+        self.icon_search_order = []  # Icon names in priority order, built once with the templates
         self.scales = np.array([0.22, 0.24, 0.26, 0.28, 0.30])
+        self.pyramid_levels = 2  # Coarse passes on the scan region shrunk by 2, 4, ...
+        self.prefilter_margin = 0.2  # How far below threshold a coarse hit may score
+        self.last_hit_scale = {}  # {icon: scale it last matched at} - tried first on the next frame
+        self.early_accept_confidence = 0.9  # A match this good ends the icon's scale search
+        
+        # Icons are matched in parallel (matchTemplate releases the GIL). OpenCV's own
+        # threading is turned off so the workers don't oversubscribe the cores
+        cv2.setNumThreads(1)
+        self._pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
         
         self.detector = GameIconDetector(
             threshold=0.8,
@@ -41,15 +55,31 @@ class LiveIconOverlay:
         self.running = False
         self.overlay_visible = False
         self.capture_thread = None
+        # Newest detections from the detection thread - a single slot, so the UI only ever
+        # draws the latest frame and stale ones are dropped if it falls behind
+        self._detection_queue = queue.Queue(maxsize=1)
+        self._delivery_pending = threading.Event()  # Set while a _deliver_detections call is scheduled
         self.overlay_canvas = None
-        self.screen_width = pyautogui.size().width
-        self.screen_height = pyautogui.size().height
+        self._overlay_slots = []  # Canvas items per detection slot: (box, [outline texts], text), reused
+        self._overlay_key = None  # What the detection items on the overlay currently show
+        self._zone_pixels = None  # Scan area the detection zone rectangle is drawn at
+        # Query the screen size once from Tk instead of asking pyautogui twice
+        self.screen_width = self.root.winfo_screenwidth()
+        self.screen_height = self.root.winfo_screenheight()
         
         self.monitor_width = self.screen_width
         self.monitor_height = self.screen_height
         
         self.current_detections = []
         
+        # Static-frame skip: a 16x16 thumbnail of the last matched scan area, and the
+        # (left, top, threshold) it was matched with
+        self.static_frame_diff = 300  # Max summed thumbnail difference for "same frame"
+        self.static_frame_max_age = 2.0  # Rematch at least this often (s) even if nothing moved
+        self._prev_thumb = None
+        self._prev_frame_key = None
+        self._prev_match_time = 0.0
+        
         self.setup_ui()
         self.preprocess_all_templates()
         
@@ -83,6 +113,7 @@ class LiveIconOverlay:
             
             # Create scaled versions at all scales
             self.preprocessed_templates[icon_name] = {}
+            self.template_pyramids[icon_name] = {}
             
             for scale in self.scales:
                 # Get original dimensions
@@ -101,8 +132,32 @@ class LiveIconOverlay:
                 
                 # Store preprocessed template
                 self.preprocessed_templates[icon_name][scale] = template_scaled
+                
+                # Shrunk copies for the coarse-to-fine passes
+                template_pyramid = [template_scaled]
+                for _ in range(self.pyramid_levels):
+                    template_pyramid.append(cv2.pyrDown(template_pyramid[-1]))
+                self.template_pyramids[icon_name][scale] = template_pyramid
+        
+        # Search order is fixed for the session, so don't re-list the icon folder on every frame
+        self.icon_search_order = [icon_file.stem for icon_file in self.detector.prioritize_icon_search(icon_files)
+                                  if icon_file.stem in self.preprocessed_templates]
         
         print(f"✅ Preprocessing complete! {len(self.preprocessed_templates)} icons ready for high-speed detection")
+    
+    def reload_icons(self):
+        """Re-read the market_icons folder (e.g. after adding an icon) and rebuild templates and search order"""
+        # The detection workers read the template dicts while they run
+        if self.running:
+            self.status_var.set("Stop detection before reloading icons")
+            return
+        
+        self.preprocessed_templates = {}
+        self.template_pyramids = {}
+        self.icon_search_order = []
+        self.last_hit_scale = {}
+        self.preprocess_all_templates()
+        self.status_var.set(f"Reloaded {len(self.icon_search_order)} icons")
         
     def setup_ui(self):
         """Setup the user interface"""
@@ -126,6 +181,10 @@ class LiveIconOverlay:
         test_zone_button = ttk.Button(control_frame, text="Test Zone", command=self.test_detection_zone)
         test_zone_button.pack(side=tk.LEFT, padx=5)
         
+        # Reload icons button (templates are only read from disk at startup otherwise)
+        reload_button = ttk.Button(control_frame, text="Reload Icons", command=self.reload_icons)
+        reload_button.pack(side=tk.LEFT, padx=5)
+        
         # Settings frame
         settings_frame = ttk.LabelFrame(self.root, text="Detection Settings")
         settings_frame.pack(pady=5, padx=10, fill=tk.X)
@@ -148,6 +207,12 @@ class LiveIconOverlay:
         self.rate_label = ttk.Label(settings_frame, text="0.1")
         self.rate_label.grid(row=1, column=2, padx=5)
         
+        # Low-latency mode grabs each frame right before matching it instead of on a capture thread
+        self.low_latency_var = tk.BooleanVar(value=False)
+        low_latency_check = ttk.Checkbutton(settings_frame, text="Low latency (capture synchronously)",
+                                            variable=self.low_latency_var)
+        low_latency_check.grid(row=2, column=0, columnspan=3, sticky=tk.W)
+        
         # Scan Area Settings
         scan_area_frame = ttk.LabelFrame(self.root, text="Scan Area (% of screen)")
         scan_area_frame.pack(pady=5, padx=10, fill=tk.X)
@@ -244,13 +309,17 @@ class LiveIconOverlay:
         top = int(self.monitor_height * self.scan_area['top_percent'] / 100)
         bottom = int(self.monitor_height * self.scan_area['bottom_percent'] / 100)
         return left, top, right, bottom
+    
+    def get_scan_capture_region(self):
+        """Scan area as the (left, top, width, height) rectangle the capturers take"""
+        left, top, right, bottom = self.get_scan_area_pixels()
+        return left, top, right - left, bottom - top
         
     def create_overlay_window(self):
         """Create a transparent overlay window for drawing detections"""
         self.overlay_window = tk.Toplevel(self.root)
         self.overlay_window.title("Detection Overlay")
         self.overlay_window.attributes('-topmost', True)
-        self.overlay_window.attributes('-alpha', 0.8)  # Made less transparent for better visibility
         
         # Position for the actual screen (no multi-monitor offset needed)
         monitor_x_offset = 0  # Start at the beginning of the screen
@@ -258,7 +327,7 @@ class LiveIconOverlay:
         self.overlay_window.configure(bg='black')  # Will be made transparent
         self.overlay_window.overrideredirect(True)  # Remove window decorations
         
-        # Make the window background transparent
+        # Make the window background transparent via color key (no full-window alpha blend)
         self.overlay_window.wm_attributes('-transparentcolor', 'black')
         
         print(f"Overlay positioned for main screen: {self.monitor_width}x{self.monitor_height}+{monitor_x_offset}+0")
@@ -284,6 +353,9 @@ class LiveIconOverlay:
                                       height=self.monitor_height,
                                       bg='black', highlightthickness=0)
         self.overlay_canvas.pack()
+        self._overlay_slots = []
+        self._overlay_key = None
+        self._zone_pixels = None
         
         # Initially hide the overlay
         self.overlay_window.withdraw()
@@ -322,12 +394,11 @@ class LiveIconOverlay:
             self.overlay_visible = True
             
             # Clear and draw just the detection zone with maximum visibility
-            self.overlay_canvas.delete("all")
+            self.clear_overlay()
             self.draw_detection_zone()
             
-            # Force canvas update
-            self.overlay_canvas.update()
-            self.overlay_window.update()
+            # Flush pending redraws only - update() would also pump input events
+            self.overlay_window.update_idletasks()
             
             print("Test detection zone displayed - should be VERY visible with bright colors!")
             
@@ -397,7 +468,7 @@ class LiveIconOverlay:
                 
                 # Clear overlay
                 if self.overlay_canvas:
-                    self.overlay_canvas.delete("all")
+                    self.clear_overlay()
         except tk.TclError:
             # Window already destroyed
             self.overlay_visible = False
@@ -407,66 +478,164 @@ class LiveIconOverlay:
         
     def detection_loop(self):
         """Main detection loop running in separate thread"""
-        while self.running:
-            try:
-                start_time = time.time()
-                
-                # Update detector settings
-                self.detector.threshold = self.threshold_var.get()
-                
-                # Capture screen
-                screenshot = pyautogui.screenshot()
-                
-                # Convert PIL image to OpenCV format
-                screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-                
-                # Process with detector
-                detections = self.process_screenshot(screenshot_cv)
-                
-                # Update UI in main thread
-                self.root.after(0, self.update_overlay, detections)
-                
-                # Calculate processing time
-                process_time = time.time() - start_time
-                
-                # Update status
-                self.root.after(0, lambda: self.status_var.set(
-                    f"Detecting... ({process_time:.2f}s) - Found {len(detections)} icons"))
-                
-                # Wait for next update
-                sleep_time = max(0, self.update_rate_var.get() - process_time)
-                time.sleep(sleep_time)
-                
-            except Exception as e:
-                self.root.after(0, lambda: self.status_var.set(f"Error: {e}"))
-                time.sleep(1)
+        # Created in this thread so the mss handles belong to it (used in low-latency mode)
+        capture = ScreenCapture()
+        
+        # Grabs the next frame while this thread matches the current one, keeping only the newest
+        # Only grayscale is matched, so frames are converted straight from the capture buffer
+        grabber = FrameGrabber(self.get_scan_capture_region, interval=self.update_rate_var.get(), gray=True)
+        
+        # Nothing matched yet in this run
+        self._prev_thumb = None
+        status_time = 0.0  # When the status line was last updated
+        next_time = time.monotonic()  # Frame deadline in low-latency mode
+        
+        try:
+            while self.running:
+                try:
+                    # Update detector settings
+                    self.detector.threshold = self.threshold_var.get()
+                    
+                    # Capture just the scan area, in grayscale (no full-screen copy)
+                    left, top, width, height = self.get_scan_capture_region()
+                    low_latency = self.low_latency_var.get()
+                    if low_latency:
+                        grabber.stop()
+                        scan_region = capture.grab_gray(left, top, width, height)
+                    else:
+                        # The grabber paces frames at the update rate, so no sleep is needed below
+                        grabber.interval = self.update_rate_var.get()
+                        grabber.start()
+                        frame = grabber.get_frame(timeout=1.0)
+                        if frame is None:
+                            continue
+                        scan_region = frame[0]
+                        
+                        # Frames grabbed before the scan area changed don't line up with it anymore
+                        if scan_region.shape[:2] != (height, width):
+                            continue
+                    
+                    start_time = time.perf_counter()
+                    
+                    if self.frame_unchanged(scan_region, left, top):
+                        # Same picture as last time - the overlay already shows its detections
+                        detections = self.current_detections
+                    else:
+                        # Process with detector
+                        detections = self.process_scan_region(scan_region, left, top)
+                        self.current_detections = detections
+                        
+                        # Hand the frame to the main thread
+                        self._publish_detections(detections)
+                    
+                    # Calculate processing time
+                    process_time = time.perf_counter() - start_time
+                    
+                    # Update status, at most 5 times a second - each call queues a Tk event
+                    if start_time - status_time >= 0.2:
+                        status_time = start_time
+                        self.root.after(0, self.status_var.set,
+                                        f"Detecting... ({process_time:.2f}s) - Found {len(detections)} icons")
+                    
+                    # Wait for next update
+                    if low_latency:
+                        next_time = sleep_until_next_frame(next_time, self.update_rate_var.get())
+                    
+                except Exception as e:
+                    # Format now - e is cleared when the except block ends
+                    self.root.after(0, self.status_var.set, f"Error: {e}")
+                    time.sleep(1)
+        finally:
+            # Joins the capture thread before the detection thread exits
+            grabber.stop()
+            capture.close()
                 
-    def process_screenshot(self, screenshot_cv):
-        """Process screenshot with the icon detector using custom scan area"""
-        detections = []
+    def _publish_detections(self, detections):
+        """Replace any undelivered frame with this one and make sure the main thread picks it up"""
+        try:
+            self._detection_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._detection_queue.put_nowait(detections)
+        
+        # Only one delivery queued on the Tk event loop at a time
+        if not self._delivery_pending.is_set():
+            self._delivery_pending.set()
+            self.root.after(0, self._deliver_detections)
+    
+    def _deliver_detections(self):
+        """Draw the newest detections (runs in the main thread)"""
+        self._delivery_pending.clear()
+        try:
+            detections = self._detection_queue.get_nowait()
+        except queue.Empty:
+            return
+        
+        # Frames still in flight after stopping would redraw the cleared overlay
+        if not self.running:
+            return
         
+        self.update_overlay(detections)
+    
+    def frame_unchanged(self, scan_region, left, top):
+        """
+        Check whether the scan area looks the same as the last frame that was matched, using the
+        summed difference of 16x16 thumbnails. Remembers this frame when it differs, or when
+        the cached match is older than static_frame_max_age.
+        """
+        thumb = cv2.resize(scan_region, (16, 16), interpolation=cv2.INTER_AREA)
+        frame_key = (left, top, self.detector.threshold)
+        now = time.monotonic()
+        
+        if (self._prev_thumb is not None and frame_key == self._prev_frame_key
+                and now - self._prev_match_time < self.static_frame_max_age
+                and thumb.shape == self._prev_thumb.shape
+                and int(cv2.absdiff(thumb, self._prev_thumb).sum()) < self.static_frame_diff):
+            return True
+        
+        self._prev_thumb = thumb
+        self._prev_frame_key = frame_key
+        self._prev_match_time = now
+        return False
+    
+    def process_screenshot(self, screenshot_cv):
+        """Process a full screenshot with the icon detector using custom scan area"""
         # Get custom scan area coordinates
         left, top, right, bottom = self.get_scan_area_pixels()
         
-        scan_region = screenshot_cv[top:bottom, left:right]
+        return self.process_scan_region(screenshot_cv[top:bottom, left:right], left, top)
+    
+    def process_scan_region(self, scan_region, left, top):
+        """
+        Find icons in an already cropped scan region.
+        
+        Args:
+            scan_region: Scan area in color (BGR) or grayscale
+            left (int): Screen X of the region's left edge
+            top (int): Screen Y of the region's top edge
+            
+        Returns:
+            List of detection dicts in screen coordinates
+        """
+        detections = []
         
-        icon_files = list(self.detector.icons_dir.glob("*.png"))
-        if not icon_files:
+        if not self.icon_search_order:
             return detections
-            
-        icon_files = self.detector.prioritize_icon_search(icon_files)
         
-        for icon_file in icon_files:
+        # Grayscale, equalize, pad and shrink the scan region once per frame instead of once per icon
+        region_padded = self.prepare_scan_region(scan_region)
+        region_pyramid = self.build_region_pyramid(region_padded)
+        
+        # Search every icon at once, but collect in priority order so the first 3 found win
+        futures = [self._pool.submit(self.find_matches_optimized, scan_region, icon_name, left, top,
+                                     region_padded, region_pyramid)
+                   for icon_name in self.icon_search_order]
+        
+        for icon_name, future in zip(self.icon_search_order, futures):
             if len(detections) >= 3:
                 break
-                
-            icon_name = icon_file.stem
-            
-            # Skip if we don't have preprocessed templates for this icon
-            if icon_name not in self.preprocessed_templates:
-                continue
             
-            matches, best_confidence = self.find_matches_optimized(scan_region, icon_name, left, top)
+            matches, best_confidence = future.result()
             
             if matches:
                 for match in matches:
@@ -481,31 +650,107 @@ class LiveIconOverlay:
                         'confidence': match['confidence']
                     }
                     detections.append(adjusted_match)
+        
+        # Searches still queued past the early exit aren't needed anymore
+        for future in futures:
+            future.cancel()
                     
         return detections
     
-    def find_matches_optimized(self, region_image, icon_name, offset_x, offset_y):
-        """Find template matches using preprocessed templates for maximum speed"""
-        # Convert region to grayscale once
-        region_gray = cv2.cvtColor(region_image, cv2.COLOR_BGR2GRAY)
+    def prepare_scan_region(self, region_image, pad_size=5):
+        """Grayscale, equalize (if preprocessing is on) and reflect-pad the scan region for matching"""
+        if region_image.ndim == 2:
+            # Captured in grayscale already
+            region_gray = region_image
+        else:
+            region_gray = cv2.cvtColor(region_image, cv2.COLOR_BGR2GRAY)
         
         # Apply preprocessing to region
         if self.detector.use_preprocessing:
             region_gray = cv2.equalizeHist(region_gray)
         
+        return cv2.copyMakeBorder(region_gray, pad_size, pad_size, pad_size, pad_size,
+                                  cv2.BORDER_REFLECT)
+    
+    def build_region_pyramid(self, region_padded):
+        """Gaussian pyramid of the prepared scan region: [full size, 1/2, 1/4, ...]"""
+        region_pyramid = [region_padded]
+        for _ in range(self.pyramid_levels):
+            region_pyramid.append(cv2.pyrDown(region_pyramid[-1]))
+        return region_pyramid
+    
+    def find_candidate_roi(self, region_pyramid, template_pyramid):
+        """
+        Coarse-to-fine pass for one scaled template: match on the smallest level, then only
+        around the hits on each bigger level, down to half size.
+        
+        Args:
+            region_pyramid: Output of build_region_pyramid
+            template_pyramid: The scaled template and its pyrDown'd copies
+            
+        Returns:
+            (x0, y0, x1, y1) rectangle of the full-size region worth matching,
+            or None if the template scored too low on a coarse level
+        """
+        coarse_threshold = self.detector.threshold - self.prefilter_margin
+        region_height, region_width = region_pyramid[0].shape
+        x0, y0, x1, y1 = 0, 0, region_width, region_height
+        
+        for level in range(len(region_pyramid) - 1, 0, -1):
+            level_region = region_pyramid[level]
+            level_template = template_pyramid[level]
+            factor = 2 ** level
+            
+            # Rectangle carried down from the level above, in this level's pixels
+            lx0, ly0 = x0 // factor, y0 // factor
+            lx1 = min(level_region.shape[1], -(-x1 // factor))
+            ly1 = min(level_region.shape[0], -(-y1 // factor))
+            roi = level_region[ly0:ly1, lx0:lx1]
+            
+            # Too small to correlate reliably at this size - leave it to the next level
+            if (min(level_template.shape) < 8 or roi.shape[0] < level_template.shape[0]
+                    or roi.shape[1] < level_template.shape[1]):
+                continue
+            
+            result = cv2.matchTemplate(roi, level_template, cv2.TM_CCOEFF_NORMED)
+            ys, xs = np.nonzero(result >= coarse_threshold)
+            if not len(xs):
+                return None
+            
+            # Box around all hits, plus a pixel of slack for the position lost by shrinking
+            template_height, template_width = template_pyramid[0].shape
+            x0 = max(0, (lx0 + int(xs.min()) - 1) * factor)
+            y0 = max(0, (ly0 + int(ys.min()) - 1) * factor)
+            x1 = min(region_width, (lx0 + int(xs.max()) + 2) * factor + template_width)
+            y1 = min(region_height, (ly0 + int(ys.max()) + 2) * factor + template_height)
+        
+        return x0, y0, x1, y1
+    
+    def find_matches_optimized(self, region_image, icon_name, offset_x, offset_y, region_padded=None,
+                               region_pyramid=None):
+        """Find template matches using preprocessed templates, coarse-to-fine over the region pyramid"""
         # Check if we have preprocessed templates for this icon
         if icon_name not in self.preprocessed_templates:
-            return []
+            return [], 0
         
-        all_matches = []
+        best_match = None  # (x, y, width, height, confidence, scale) of the best match so far
         best_confidence = 0
         
+        # Shared across icons when called from process_screenshot
         pad_size = 5
-        region_padded = cv2.copyMakeBorder(region_gray, pad_size, pad_size, pad_size, pad_size, 
-                                         cv2.BORDER_REFLECT)
+        if region_padded is None:
+            region_padded = self.prepare_scan_region(region_image, pad_size)
+        if region_pyramid is None:
+            region_pyramid = self.build_region_pyramid(region_padded)
+        
+        # Icons rarely change size between frames, so start with the scale that matched last time
+        scales = self.scales
+        hit_scale = self.last_hit_scale.get(icon_name)
+        if hit_scale is not None:
+            scales = [hit_scale] + [scale for scale in self.scales if scale != hit_scale]
         
         # Use preprocessed templates for maximum speed
-        for scale in self.scales:
+        for scale in scales:
             # Get preprocessed template for this scale
             if scale not in self.preprocessed_templates[icon_name]:
                 continue
@@ -517,8 +762,18 @@ class LiveIconOverlay:
             if template_width > region_image.shape[1] * 0.8 or template_height > region_image.shape[0] * 0.8:
                 continue
             
-            # Perform template matching on padded region (no resizing needed!)
-            result = cv2.matchTemplate(region_padded, template_scaled, cv2.TM_CCOEFF_NORMED)
+            # Shrunk passes first - most templates are ruled out before the full-size match
+            roi = self.find_candidate_roi(region_pyramid, self.template_pyramids[icon_name][scale])
+            if roi is None:
+                continue
+            x0, y0, x1, y1 = roi
+            
+            # Full-size match inside the ROI only (no resizing needed!), placed in a map of the
+            # whole padded region so the edge checks below stay in region coordinates
+            result = np.full((region_padded.shape[0] - template_height + 1,
+                              region_padded.shape[1] - template_width + 1), -1, dtype=np.float32)
+            result[y0:y1 - template_height + 1, x0:x1 - template_width + 1] = cv2.matchTemplate(
+                region_padded[y0:y1, x0:x1], template_scaled, cv2.TM_CCOEFF_NORMED)
             
             # Find the best match for this scale
             min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
@@ -529,49 +784,50 @@ class LiveIconOverlay:
             # Use a slightly lower threshold for initial detection, then filter by quality
             detection_threshold = max(0.25, self.detector.threshold - 0.15)
             
-            # Find all matches above threshold for this scale
+            # Find the best match above threshold for this scale
             if max_val >= detection_threshold:
-                locations = np.where(result >= detection_threshold)
+                # Only the single best match is returned, so the strongest point away from the
+                # edges (likely edge artifacts) is all that's needed - no per-pixel candidates
+                interior = result[pad_size + 5:max(0, result.shape[0] - 4), pad_size + 5:max(0, result.shape[1] - 4)]
+                if interior.size == 0:
+                    continue
+                _, confidence, _, (x, y) = cv2.minMaxLoc(interior)
                 
-                for pt in zip(*locations[::-1]):  # Switch x and y coordinates
-                    x, y = pt
-                    confidence = result[y, x]
-                    
-                    # Only accept matches that meet the original threshold
-                    if confidence < self.detector.threshold:
-                        continue
-                    
-                    # Adjust coordinates to account for padding and scan region offset
-                    actual_x = int(x - pad_size + offset_x)
-                    actual_y = int(y - pad_size + offset_y)
-                    
-                    # Skip matches too close to edges (likely edge artifacts)
-                    if (x < pad_size + 5 or y < pad_size + 5 or 
-                        x > result.shape[1] - 5 or y > result.shape[0] - 5):
-                        continue
-                    
-                    match_info = {
-                        'x': actual_x,
-                        'y': actual_y,
-                        'width': int(template_width),
-                        'height': int(template_height),
-                        'center_x': int(actual_x + template_width // 2),
-                        'center_y': int(actual_y + template_height // 2),
-                        'confidence': float(confidence),
-                        'scale': float(scale)
-                    }
-                    all_matches.append(match_info)
-        
-        # Remove overlapping matches
-        filtered_matches = self.detector._remove_overlapping_matches(all_matches)
+                # Only accept matches that meet the original threshold
+                if confidence >= max(detection_threshold, self.detector.threshold):
+                    if best_match is None or confidence > best_match[4]:
+                        # Adjust coordinates to account for padding, the edge margin and scan region offset
+                        best_match = (x + 5 + offset_x, y + 5 + offset_y,
+                                      int(template_width), int(template_height), confidence, float(scale))
+                        
+                        # Confident enough that another scale won't change the answer
+                        if confidence >= self.early_accept_confidence:
+                            break
         
         # Return only the best match for this icon
-        if filtered_matches:
-            best_match = max(filtered_matches, key=lambda x: x['confidence'])
-            return [best_match], best_confidence
-        
-        return filtered_matches, best_confidence
-        
+        if best_match is None:
+            return [], best_confidence
+        
+        x, y, width, height, confidence, scale = best_match
+        self.last_hit_scale[icon_name] = scale
+        return [{
+            'x': x,
+            'y': y,
+            'width': width,
+            'height': height,
+            'center_x': x + width // 2,
+            'center_y': y + height // 2,
+            'confidence': confidence,
+            'scale': scale
+        }], best_confidence
+        
+    def clear_overlay(self):
+        """Delete everything on the overlay canvas and forget the reusable items"""
+        self.overlay_canvas.delete("all")
+        self._overlay_slots = []
+        self._overlay_key = None
+        self._zone_pixels = None
+    
     def update_overlay(self, detections):
         """Update the overlay with current detections"""
         if not self.overlay_canvas or not self.overlay_window:
@@ -582,12 +838,6 @@ class LiveIconOverlay:
                 return
         except tk.TclError:
             return
-            
-        # Clear previous overlays
-        try:
-            self.overlay_canvas.delete("all")
-        except tk.TclError:
-            return
         
         # Draw detection zone rectangle
         self.draw_detection_zone()
@@ -595,26 +845,28 @@ class LiveIconOverlay:
         # Get scan area coordinates to position icons above it
         left, top, right, bottom = self.get_scan_area_pixels()
         
-        for i, detection in enumerate(detections):
-            try:
-                colors = ['#00FF00', '#FF0000', '#0000FF', '#FFFF00', '#FF00FF', '#00FFFF']
+        # Same icons in the same places as last frame - leave the canvas items alone
+        overlay_key = (left, top) + tuple((d['icon_name'], d['x'], d['y'], d['width'], d['height'],
+                                           f"{d['confidence']:.3f}") for d in detections)
+        if overlay_key == self._overlay_key:
+            return
+        self._overlay_key = overlay_key
+        
+        colors = ['#00FF00', '#FF0000', '#0000FF', '#FFFF00', '#FF00FF', '#00FFFF']
+        icon_size = 40
+        # Black outline offsets around the white label text
+        outline_offsets = [(dx, dy) for dx in [-1, 0, 1] for dy in [-1, 0, 1] if dx != 0 or dy != 0]
+        
+        try:
+            for i, detection in enumerate(detections):
                 color = colors[i % len(colors)]
                 
-                x, y = detection['x'], detection['y']
-                w, h = detection['width'], detection['height']
-                cx, cy = detection['center_x'], detection['center_y']
-                
                 display_x = left + (i * 100)
                 display_y = top - 80
                 
                 if display_y < 10:
                     display_y = 10
                 
-                icon_size = 40
-                self.overlay_canvas.create_rectangle(display_x, display_y, 
-                                                   display_x + icon_size, display_y + icon_size,
-                                                   outline=color, width=3, fill=color, stipple='gray25')
-                
                 # Get troop information
                 troop = get_troop_by_icon_name(detection['icon_name'])
                 
@@ -632,57 +884,79 @@ class LiveIconOverlay:
                     # Fallback to basic info
                     label = f"{detection['icon_name']}\n{detection['confidence']:.2f}"
                 
-                # Draw text with outline for better visibility
                 text_x = display_x + icon_size//2
                 text_y = display_y + icon_size + 5
                 
-                # Black outline
-                for dx in [-1, 0, 1]:
-                    for dy in [-1, 0, 1]:
-                        if dx != 0 or dy != 0:
-                            self.overlay_canvas.create_text(text_x + dx, text_y + dy, 
-                                                          text=label, fill='black', font=('Arial', 8, 'bold'),
-                                                          anchor='n')
+                if i < len(self._overlay_slots):
+                    # Move and relabel this slot's existing items
+                    box, outlines, text = self._overlay_slots[i]
+                    self.overlay_canvas.coords(box, display_x, display_y,
+                                               display_x + icon_size, display_y + icon_size)
+                    self.overlay_canvas.itemconfigure(box, outline=color, fill=color, state='normal')
+                    for outline, (dx, dy) in zip(outlines, outline_offsets):
+                        self.overlay_canvas.coords(outline, text_x + dx, text_y + dy)
+                        self.overlay_canvas.itemconfigure(outline, text=label, state='normal')
+                    self.overlay_canvas.coords(text, text_x, text_y)
+                    self.overlay_canvas.itemconfigure(text, text=label, state='normal')
+                    continue
+                
+                # First time this many icons are shown - create the slot's items
+                box = self.overlay_canvas.create_rectangle(display_x, display_y,
+                                                           display_x + icon_size, display_y + icon_size,
+                                                           outline=color, width=3, fill=color, stipple='gray25')
+                
+                # Draw text with outline for better visibility
+                outlines = [self.overlay_canvas.create_text(text_x + dx, text_y + dy,
+                                                            text=label, fill='black', font=('Arial', 8, 'bold'),
+                                                            anchor='n')
+                            for dx, dy in outline_offsets]
                 
                 # White text on top
-                self.overlay_canvas.create_text(text_x, text_y, 
-                                              text=label, fill='white', font=('Arial', 8, 'bold'),
-                                              anchor='n')
-                                              
-            except tk.TclError:
-                break
+                text = self.overlay_canvas.create_text(text_x, text_y,
+                                                       text=label, fill='white', font=('Arial', 8, 'bold'),
+                                                       anchor='n')
+                self._overlay_slots.append((box, outlines, text))
+            
+            # Hide the slots of icons that are gone
+            for box, outlines, text in self._overlay_slots[len(detections):]:
+                for item in (box, *outlines, text):
+                    self.overlay_canvas.itemconfigure(item, state='hidden')
+        except tk.TclError:
+            pass
                 
         self.update_detection_text(detections)
     
     def draw_detection_zone(self):
         try:
-            left, top, right, bottom = self.get_scan_area_pixels()
+            zone_pixels = self.get_scan_area_pixels()
             
-            self.overlay_canvas.delete("detection_zone")
-            
-            self.overlay_canvas.create_rectangle(
-                left, top, right, bottom,
-                outline='lime', width=3, tags="detection_zone", fill=''
-            )
+            # Already drawn at this scan area - no Tcl calls at all (clear_overlay resets this)
+            if zone_pixels == self._zone_pixels:
+                return
             
-            self.overlay_canvas.update_idletasks()
+            # Reuse the existing zone rectangle and only move it when the scan area changed
+            if self.overlay_canvas.find_withtag("detection_zone"):
+                self.overlay_canvas.coords("detection_zone", *zone_pixels)
+            else:
+                self.overlay_canvas.create_rectangle(
+                    *zone_pixels,
+                    outline='lime', width=3, tags="detection_zone", fill=''
+                )
+            self._zone_pixels = zone_pixels
             
         except (tk.TclError, AttributeError) as e:
             pass
         
     def update_detection_text(self, detections):
         """Update the detection text display"""
+        text = "".join(f"{detection['icon_name']}: {detection['confidence']:.3f} "
+                       f"at ({detection['center_x']}, {detection['center_y']})\n"
+                       for detection in detections)
+        
         try:
+            # One delete and one insert, so the widget lays out once per update
             self.detection_text.delete(1.0, tk.END)
-            
-            if not detections:
-                self.detection_text.insert(tk.END, "No icons detected")
-                return
-                
-            for detection in detections:
-                text = f"{detection['icon_name']}: {detection['confidence']:.3f} "
-                text += f"at ({detection['center_x']}, {detection['center_y']})\n"
-                self.detection_text.insert(tk.END, text)
+            self.detection_text.insert(tk.END, text or "No icons detected")
         except tk.TclError:
             # Widget destroyed, ignore
             pass
@@ -699,6 +973,7 @@ class LiveIconOverlay:
         
         # Wait a moment for threads to finish
         time.sleep(0.1)
+        self._pool.shutdown(wait=False)
         
         # Destroy overlay window safely
         try:
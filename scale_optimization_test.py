@@ -7,12 +7,22 @@ for your specific icon detection setup.
 
 import cv2
 import numpy as np
+import os
 import pyautogui
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from game_icon_detector import GameIconDetector
+from screen_capture import grab_region
 import json
 
+# Optional faster JSON encoder for the results file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class ScaleOptimizationTester:
     def __init__(self):
         self.detector = GameIconDetector(
@@ -31,8 +41,9 @@ class ScaleOptimizationTester:
         }
         
         # Get screen dimensions
-        self.screen_width = pyautogui.size().width
-        self.screen_height = pyautogui.size().height
+        self.screen_width, self.screen_height = pyautogui.size()
+        
+        self._result_buffers = threading.local()  # One reusable matchTemplate output per worker
         
     def get_scan_area_pixels(self):
         """Convert scan area percentages to pixel coordinates"""
@@ -42,6 +53,33 @@ class ScaleOptimizationTester:
         bottom = int(self.screen_height * self.scan_area['bottom_percent'] / 100)
         return left, top, right, bottom
     
+    def grab_scan_region(self):
+        """Capture just the scan area (BGR, no full-screen screenshot or color conversion)"""
+        left, top, right, bottom = self.get_scan_area_pixels()
+        return grab_region(left, top, right - left, bottom - top)
+    
+    def prepare_gray(self, image):
+        """Grayscale (and equalize, if preprocessing is on) an image once for all scale tests"""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        if self.detector.use_preprocessing:
+            gray = cv2.equalizeHist(gray)
+        return gray
+    
+    def load_test_templates(self, icon_files):
+        """
+        Load and prepare the templates to test.
+        
+        Returns:
+            List of (icon_name, template_gray)
+        """
+        templates = []
+        for icon_file in icon_files:
+            template_image = cv2.imread(str(icon_file))
+            if template_image is None:
+                continue
+            templates.append((icon_file.stem, self.prepare_gray(template_image)))
+        return templates
+    
     def test_scale_ranges(self):
         """Test different scale ranges to find optimal ones"""
         print("Starting Scale Optimization Test...")
@@ -59,14 +97,10 @@ class ScaleOptimizationTester:
             "Extra Large": np.linspace(1.0, 1.5, 10)
         }
         
-        # Take a screenshot for testing
+        # Take a screenshot of the scan region for testing
         print("Taking screenshot for analysis...")
-        screenshot = pyautogui.screenshot()
-        screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        
-        # Get scan region
         left, top, right, bottom = self.get_scan_area_pixels()
-        scan_region = screenshot_cv[top:bottom, left:right]
+        scan_region = self.grab_scan_region()
         
         print(f"Scan region: {scan_region.shape[1]}x{scan_region.shape[0]} pixels")
         print(f"Scan area: ({left},{top}) to ({right},{bottom})")
@@ -81,29 +115,28 @@ class ScaleOptimizationTester:
         print(f"Testing {len(icon_files)} icon templates")
         print("=" * 60)
         
+        # The scan region and templates are the same for every scale - prepare them once
+        region_gray = self.prepare_gray(scan_region)
+        templates = self.load_test_templates(icon_files[:5])  # Test first 5 icons for speed
+        all_confidences = self.run_scale_tests(region_gray, templates, scale_tests)
+        
         results = {}
         
         for range_name, scales in scale_tests.items():
             print(f"\nTesting {range_name} range: {scales[0]:.2f} to {scales[-1]:.2f}")
             range_results = []
             
-            for icon_file in icon_files[:5]:  # Test first 5 icons for speed
-                icon_name = icon_file.stem
-                template_image = cv2.imread(str(icon_file))
-                if template_image is None:
-                    continue
-                
+            for (icon_name, _), confidences in zip(templates, all_confidences[range_name]):
                 best_scale_confidence = 0
                 best_scale = 0
                 scale_confidences = []
                 
-                for scale in scales:
-                    confidence = self.test_single_scale(scan_region, template_image, scale)
+                for scale, confidence in zip(scales, confidences):
                     scale_confidences.append(confidence)
                     
                     if confidence > best_scale_confidence:
                         best_scale_confidence = confidence
-                        best_scale = scale
+                        best_scale = float(scale)  # Plain float, so the results serialize as-is
                 
                 if best_scale_confidence > 0.5:  # Only include meaningful results
                     range_results.append({
@@ -128,18 +161,53 @@ class ScaleOptimizationTester:
         self.analyze_results(results)
         return results
     
-    def test_single_scale(self, region_image, template_image, scale):
-        """Test a single scale and return best confidence"""
-        try:
-            # Convert to grayscale
-            region_gray = cv2.cvtColor(region_image, cv2.COLOR_BGR2GRAY)
-            template_gray = cv2.cvtColor(template_image, cv2.COLOR_BGR2GRAY)
-            
-            # Apply preprocessing
-            if self.detector.use_preprocessing:
-                region_gray = cv2.equalizeHist(region_gray)
-                template_gray = cv2.equalizeHist(template_gray)
+    def run_scale_tests(self, region_gray, templates, scale_tests):
+        """
+        Run every (range, icon, scale) test on a thread pool - matchTemplate releases the GIL.
+        Scales that round to the same template size get the same score, so each icon is
+        matched once per pixel size (neighbouring ranges share their end scales).
+        
+        Args:
+            region_gray: Scan region from prepare_gray()
+            templates: Output of load_test_templates()
+            scale_tests: {range_name: scales}
             
+        Returns:
+            {range_name: [[confidence per scale] per template]}, in the same order as the inputs
+        """
+        # One match per worker thread - keep OpenCV's own threading out of the way while the pool runs
+        previous_threads = cv2.getNumThreads()
+        cv2.setNumThreads(1)
+        try:
+            with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+                size_futures = [{} for _ in templates]  # Per template: {(width, height): future}
+                futures = {}
+                
+                for range_name, scales in scale_tests.items():
+                    range_futures = futures[range_name] = []
+                    for (_, template_gray), by_size in zip(templates, size_futures):
+                        template_height, template_width = template_gray.shape
+                        icon_futures = []
+                        for scale in scales:
+                            size = (int(template_width * scale), int(template_height * scale))
+                            if size not in by_size:
+                                by_size[size] = pool.submit(self.test_single_scale, region_gray,
+                                                            template_gray, scale)
+                            icon_futures.append(by_size[size])
+                        range_futures.append(icon_futures)
+                
+                return {range_name: [[future.result() for future in icon_futures]
+                                     for icon_futures in range_futures]
+                        for range_name, range_futures in futures.items()}
+        finally:
+            cv2.setNumThreads(previous_threads)
+    
+    def test_single_scale(self, region_gray, template_gray, scale):
+        """
+        Test a single scale and return best confidence.
+        Both images come from prepare_gray(), so only the resize and match happen per scale.
+        """
+        try:
             # Get template dimensions
             template_height, template_width = template_gray.shape
             
@@ -150,23 +218,36 @@ class ScaleOptimizationTester:
             # Skip if template becomes too small or too large
             if new_width < 5 or new_height < 5:
                 return 0.0
-            if new_width > region_image.shape[1] or new_height > region_image.shape[0]:
+            if new_width > region_gray.shape[1] or new_height > region_gray.shape[0]:
                 return 0.0
             
-            # Resize template
+            # Resize template (same default interpolation as the live overlay's preprocessing)
             template_scaled = cv2.resize(template_gray, (new_width, new_height))
             
-            # Perform template matching
-            result = cv2.matchTemplate(region_gray, template_scaled, cv2.TM_CCOEFF_NORMED)
+            # Perform template matching, written into this thread's reusable buffer
+            result_view = self._result_view(region_gray.shape[0] - new_height + 1,
+                                            region_gray.shape[1] - new_width + 1, region_gray.shape)
+            result = cv2.matchTemplate(region_gray, template_scaled, cv2.TM_CCOEFF_NORMED, result=result_view)
             
-            # Get best match
-            min_val, max_val, min_loc, max_loc = cv2.minMaxLoc(result)
-            
-            return float(max_val)
+            # Only the best score is used, so skip minMaxLoc's location and minimum tracking
+            return float(result.max())
             
         except Exception as e:
             return 0.0
     
+    def _result_view(self, height, width, region_shape):
+        """
+        Get a (height x width) float32 view into this thread's reusable result buffer, so
+        matchTemplate writes in place instead of allocating a new output on every call.
+        Each result is reduced before the thread's next match, so one buffer per thread is enough.
+        """
+        buffer = getattr(self._result_buffers, 'buffer', None)
+        if buffer is None or buffer.shape[0] < height or buffer.shape[1] < width:
+            # Sized for the whole scan region, which bounds every result map
+            buffer = np.empty((max(height, region_shape[0]), max(width, region_shape[1])), dtype=np.float32)
+            self._result_buffers.buffer = buffer
+        return buffer[:height, :width]
+    
     def analyze_results(self, results):
         """Analyze results and provide recommendations"""
         print("\n" + "=" * 60)
@@ -233,19 +314,20 @@ class ScaleOptimizationTester:
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"scale_test_results_{timestamp}.json"
         
-        with open(filename, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        if orjson is not None:
+            # Everything in the results is already a plain str/float/list, which orjson requires
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
         
         print(f"\nDetailed results saved to: {filename}")
     
     def quick_test(self):
         """Quick test with current optimal scales"""
         print("Quick test with current scales...")
-        screenshot = pyautogui.screenshot()
-        screenshot_cv = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-        
-        left, top, right, bottom = self.get_scan_area_pixels()
-        scan_region = screenshot_cv[top:bottom, left:right]
+        scan_region = self.grab_scan_region()
         
         current_scales = [0.25, 0.3, 0.35]
         
@@ -254,15 +336,12 @@ class ScaleOptimizationTester:
         print(f"Testing scales: {current_scales}")
         print("-" * 40)
         
-        for icon_file in icon_files:
-            icon_name = icon_file.stem
-            template_image = cv2.imread(str(icon_file))
-            if template_image is None:
-                continue
-            
+        region_gray = self.prepare_gray(scan_region)
+        
+        for icon_name, template_gray in self.load_test_templates(icon_files):
             print(f"{icon_name}:")
             for scale in current_scales:
-                confidence = self.test_single_scale(scan_region, template_image, scale)
+                confidence = self.test_single_scale(region_gray, template_gray, scale)
                 print(f"  Scale {scale}: {confidence:.3f}")
 
 def main():
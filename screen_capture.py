@@ -0,0 +1,307 @@
+"""
+Screen Capture helpers for grabbing screen regions.
+Uses DXGI Desktop Duplication (dxcam) on Windows when available, otherwise python-mss,
+so only the requested rectangle is copied instead of the whole desktop.
+Without mss, falls back to PIL ImageGrab with a bounding box. Only macOS grabs just the
+region (screencapture -R) - on Linux (X11) and Windows PIL captures the whole screen
+(every monitor on Windows) and crops it, so that path is much slower.
+
+Frames come back as BGR uint8 numpy arrays. If a frame needs resizing, use cv2.resize on
+the array directly instead of round-tripping through PIL - INTER_NEAREST is the cheap
+choice for screen pixels, INTER_AREA when downscaling for template matching.
+"""
+
+import platform
+import queue
+import threading
+import time
+import cv2
+import numpy as np
+
+try:
+    import mss
+except ImportError:
+    mss = None
+    from PIL import ImageGrab
+
+# Optional DXGI Desktop Duplication backend (Windows only)
+try:
+    import dxcam
+except ImportError:
+    dxcam = None
+
+
+def _set_dpi_aware():
+    """
+    Make the process DPI-aware on Windows, so Tk's screen size, overlay geometry and the
+    capture backends all use the same physical pixels on scaled displays
+    """
+    if platform.system() != 'Windows':
+        return
+
+    import ctypes
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(2)  # Per-monitor aware (Windows 8.1+)
+    except (AttributeError, OSError):
+        try:
+            ctypes.windll.user32.SetProcessDPIAware()
+        except (AttributeError, OSError):
+            pass
+
+
+# Done at import, before the tools create their Tk root and read the screen size
+_set_dpi_aware()
+
+# Creating the DXGI duplication interface is the expensive part, so keep one per process
+_dxcam_camera = None
+_dxcam_unavailable = dxcam is None or platform.system() != 'Windows'
+_dxcam_last_frame = None  # (region, frame) - dxcam returns None when nothing changed
+
+
+def _get_dxcam_camera():
+    """Create the shared dxcam camera on first use, or return None if it can't be used"""
+    global _dxcam_camera, _dxcam_unavailable
+
+    if _dxcam_camera is None and not _dxcam_unavailable:
+        try:
+            _dxcam_camera = dxcam.create(output_idx=0, output_color="BGR")
+        except Exception:
+            _dxcam_unavailable = True
+
+    return _dxcam_camera
+
+
+def _grab_dxcam(camera, left, top, width, height):
+    """Grab a region with dxcam, reusing the last frame if the screen hasn't changed"""
+    global _dxcam_last_frame
+
+    region = (left, top, left + width, top + height)
+    frame = camera.grab(region=region)
+
+    if frame is None:
+        # No new frame was presented since the last grab
+        if _dxcam_last_frame is not None and _dxcam_last_frame[0] == region:
+            return _dxcam_last_frame[1]
+        return None
+
+    _dxcam_last_frame = (region, frame)
+    return frame
+
+
+class ScreenCapture:
+    """
+    Reusable screen capturer holding one mss instance, so its device context and
+    bitmap are set up once instead of on every grab.
+    mss handles belong to the thread that created them - use one instance per thread.
+    """
+
+    def __init__(self):
+        self.sct = mss.mss() if mss is not None else None
+
+    def grab(self, left, top, width, height):
+        """
+        Grab a rectangle of the screen.
+
+        Args:
+            left (int): Left edge of the region in screen pixels
+            top (int): Top edge of the region in screen pixels
+            width (int): Width of the region in pixels
+            height (int): Height of the region in pixels
+
+        Returns:
+            numpy array (height x width x 3) in BGR order, same layout as cv2.imread
+
+        Regions are in the same screen pixels the tools compute from the screen size. All
+        backends return the region at that size without resampling (mss captures macOS
+        Retina displays at nominal resolution), so no resize pass is needed afterwards.
+        """
+        camera = _get_dxcam_camera()
+        if camera is not None:
+            frame = _grab_dxcam(camera, left, top, width, height)
+            if frame is not None:
+                return frame
+
+        if self.sct is None:
+            # PIL gives RGB. Only macOS captures just the bbox - X11 and Windows grab the full
+            # screen and crop. all_screens lets the bbox address secondary monitors on Windows
+            shot = ImageGrab.grab(bbox=(left, top, left + width, top + height), all_screens=True)
+            return np.asarray(shot.convert('RGB'))[:, :, ::-1]
+
+        shot = self.sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+
+        # mss returns BGRA - slice off alpha instead of running a color conversion
+        return np.asarray(shot)[:, :, :3]
+
+    def grab_gray(self, left, top, width, height):
+        """
+        Grab a rectangle of the screen as a single-channel grayscale image.
+        Same arguments as grab(); returns a (height x width) uint8 array.
+        """
+        if _get_dxcam_camera() is None and self.sct is not None:
+            # Convert straight from mss's BGRA buffer, skipping the sliced BGR copy
+            shot = self.sct.grab({'left': left, 'top': top, 'width': width, 'height': height})
+            return cv2.cvtColor(np.asarray(shot), cv2.COLOR_BGRA2GRAY)
+
+        return cv2.cvtColor(self.grab(left, top, width, height), cv2.COLOR_BGR2GRAY)
+
+    def close(self):
+        """Release the mss handles"""
+        if self.sct is not None:
+            self.sct.close()
+
+
+# One capturer per thread for grab_region()
+_thread_captures = threading.local()
+
+
+def grab_region(left, top, width, height):
+    """Grab a rectangle of the screen with this thread's shared ScreenCapture (see ScreenCapture.grab)"""
+    capture = getattr(_thread_captures, 'capture', None)
+    if capture is None:
+        capture = _thread_captures.capture = ScreenCapture()
+    return capture.grab(left, top, width, height)
+
+
+def grab_region_gray(left, top, width, height):
+    """Grayscale version of grab_region() (see ScreenCapture.grab_gray)"""
+    capture = getattr(_thread_captures, 'capture', None)
+    if capture is None:
+        capture = _thread_captures.capture = ScreenCapture()
+    return capture.grab_gray(left, top, width, height)
+
+
+def sleep_until_next_frame(next_time, interval):
+    """
+    Sleep until the next frame deadline on the monotonic clock.
+
+    Args:
+        next_time (float): time.monotonic() deadline of the frame that just ran
+        interval (float): Seconds between frames
+
+    Returns:
+        The deadline that was waited for, to pass back in on the next frame
+
+    Deadlines advance by a fixed interval, so sleep overshoot and clock steps don't add up
+    into drift. If a frame ran past its deadline the schedule restarts from now rather than
+    firing a burst of frames to catch up.
+    """
+    next_time += interval
+    delay = next_time - time.monotonic()
+    if delay > 0:
+        time.sleep(delay)
+        return next_time
+    return time.monotonic()
+
+
+class FrameGrabber:
+    """
+    Captures a screen region continuously on a background thread.
+    Only the newest frame is kept, so a slow consumer never works on stale frames.
+    Tk code should poll get_frame(timeout=0) from root.after - never touch Tk from this thread.
+    """
+
+    def __init__(self, region_getter, interval=0.0, gray=False):
+        """
+        Args:
+            region_getter: Callable returning the (left, top, width, height) region to capture
+            interval (float): Minimum seconds between captures (0 = capture as fast as possible)
+            gray (bool): Capture single-channel frames with grab_gray() instead of BGR
+        """
+        self.region_getter = region_getter
+        self.interval = interval
+        self.gray = gray
+        self.frames = queue.Queue(maxsize=1)  # Single slot holding (frame, timestamp)
+        self.thread = None
+        self._stop_event = None  # Each run gets its own, so a late-exiting old thread can't be revived
+
+    @property
+    def running(self):
+        """True while a capture thread is running and hasn't been asked to stop"""
+        return self.thread is not None and self.thread.is_alive() and not self._stop_event.is_set()
+
+    def start(self):
+        """
+        Start the capture thread.
+
+        Returns:
+            True if a capture thread is running, False if a stopped one is still finishing a
+            slow grab - a second thread would race it for the frame slot, so try again later
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return not self._stop_event.is_set()
+
+        # Whatever is left in the slot came from the previous run
+        try:
+            self.frames.get_nowait()
+        except queue.Empty:
+            pass
+
+        self._stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._capture_loop, args=(self._stop_event,), daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self, timeout=1.0):
+        """Stop the capture thread and wait (up to timeout, the first time) for it to finish"""
+        if self.thread is None:
+            return
+        if not self._stop_event.is_set():
+            self._stop_event.set()
+            if self.thread is not threading.current_thread():
+                self.thread.join(timeout)
+        # Only forget the thread once it has really exited, so start() can't run two at once
+        if not self.thread.is_alive():
+            self.thread = None
+
+    def get_frame(self, timeout=None):
+        """
+        Get the newest captured frame.
+
+        Args:
+            timeout (float): Seconds to wait for a frame (None = block, 0 = don't wait)
+
+        Returns:
+            Tuple of (frame, timestamp), or None if no frame arrived in time
+        """
+        try:
+            if timeout == 0:
+                return self.frames.get_nowait()
+            return self.frames.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _publish(self, item):
+        """Replace whatever frame is waiting with the new one"""
+        try:
+            self.frames.get_nowait()
+        except queue.Empty:
+            pass
+        self.frames.put_nowait(item)
+
+    def _capture_loop(self, stop_event):
+        """Capture loop running in the background thread until stop_event is set"""
+        # Created here so the mss handles belong to this thread and live for the whole loop
+        capture = ScreenCapture()
+
+        next_time = time.monotonic()
+
+        try:
+            while not stop_event.is_set():
+                start_time = time.time()
+
+                try:
+                    if self.gray:
+                        frame = capture.grab_gray(*self.region_getter())
+                    else:
+                        frame = capture.grab(*self.region_getter())
+                    # A grab that outlived stop() is dropped instead of landing in the next run's slot
+                    if not stop_event.is_set():
+                        self._publish((frame, start_time))
+                except Exception:
+                    # Transient capture failures (e.g. display changes) - retry shortly
+                    time.sleep(0.1)
+                    continue
+
+                next_time = sleep_until_next_frame(next_time, self.interval)
+        finally:
+            capture.close()
@@ -25,11 +25,13 @@ def main():
         "pyautogui>=0.9.54",
         "pillow>=8.0.0", 
         "opencv-python>=4.5.0",
-        "numpy>=1.21.0"
+        "numpy>=1.21.0",
+        "mss>=6.1.0"
     ]
     
     optional_packages = [
-        "pywin32>=227"  # For click-through overlay on Windows
+        "pywin32>=227",  # For click-through overlay on Windows
+        "dxcam>=0.0.5"  # For fast DXGI screen capture on Windows
     ]
     
     print("Installing required packages...")
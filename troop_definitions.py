@@ -8,8 +8,10 @@ This module defines all troops with their characteristics including:
 - Name (display name)
 """
 
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
 from enum import Enum
 
 class MergeLevel(Enum):
@@ -32,13 +34,31 @@ class Traits(Enum):
     THROWER = 10
     UNDEAD = 11
 
-@dataclass
+# Troops with the same trait combination share one tuple
+_TRAIT_COMBOS: Dict[Tuple[Traits, ...], Tuple[Traits, ...]] = {}
+
+def _traits(*traits: Traits) -> Tuple[Traits, ...]:
+    """Return the interned trait tuple for these traits (order kept for display)"""
+    return _TRAIT_COMBOS.setdefault(traits, traits)
+
+@dataclass(frozen=True)
 class Troop:
     """Base troop class with essential properties for Merge Tactics"""
+    # Fixed attributes, no per-instance __dict__ (dataclass(slots=True) needs Python 3.10)
+    __slots__ = ('name', 'cost', 'stars', 'traits')
+    
     name: str
     cost: int  # Elixir cost
     stars: MergeLevel  # Merge level (1-4 stars)
-    traits: List[Traits]  # Special abilities/characteristics
+    traits: Tuple[Traits, ...]  # Special abilities/characteristics (immutable, shared)
+    
+    # copy and pickle restore slots with setattr, which frozen blocks - go around it
+    def __getstate__(self):
+        return tuple(getattr(self, field) for field in self.__slots__)
+    
+    def __setstate__(self, state):
+        for field, value in zip(self.__slots__, state):
+            object.__setattr__(self, field, value)
     
     def __str__(self):
         return f"{self.name} ({self.cost} elixir, {self.stars.value}⭐)"
@@ -46,12 +66,32 @@ class Troop:
     def __repr__(self):
         return f"Troop(name='{self.name}', cost={self.cost}, stars={self.stars.value})"
 
+@lru_cache(maxsize=256)
+def _normalize_troop_name(name: str) -> str:
+    """Convert a display or icon name to our internal naming (handle spaces and cases)"""
+    return name.lower().replace(" ", "_").replace(".", "")
+
 class TroopRegistry:
     """Registry containing all troop definitions"""
     
     def __init__(self):
         self.troops: Dict[str, Troop] = {}
         self._initialize_troops()
+        self._build_indexes()
+    
+    def _build_indexes(self):
+        """Group the troops by cost, merge level and trait once - the registry doesn't change after init"""
+        self._by_cost: Dict[int, List[Troop]] = defaultdict(list)
+        self._by_stars: Dict[MergeLevel, List[Troop]] = defaultdict(list)
+        self._by_trait: Dict[Traits, List[Troop]] = defaultdict(list)
+        
+        for troop in self.troops.values():
+            self._by_cost[troop.cost].append(troop)
+            self._by_stars[troop.stars].append(troop)
+            for trait in troop.traits:
+                self._by_trait[trait].append(troop)
+        
+        self._all_sorted = sorted(self.troops.values(), key=lambda t: (t.cost, t.name))
     
     def _initialize_troops(self):
 
@@ -59,155 +99,155 @@ class TroopRegistry:
             name="Archer",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.CLAN, Traits.RANGER]
+            traits=_traits(Traits.CLAN, Traits.RANGER)
         )
         
         self.troops["barbarian"] = Troop(
             name="Barbarian",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.BRAWLER, Traits.CLAN]
+            traits=_traits(Traits.BRAWLER, Traits.CLAN)
         )
         
         self.troops["bomber"] = Troop(
             name="Bomber",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.THROWER, Traits.UNDEAD]
+            traits=_traits(Traits.THROWER, Traits.UNDEAD)
         )
         
         self.troops["goblin"] = Troop(
             name="Goblin",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.GOBLIN, Traits.ASSASSIN]
+            traits=_traits(Traits.GOBLIN, Traits.ASSASSIN)
         )
         
         self.troops["knight"] = Troop(
             name="Knight",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.NOBLE, Traits.JUGGERNAUT]
+            traits=_traits(Traits.NOBLE, Traits.JUGGERNAUT)
         )
         
         self.troops["spear_goblin"] = Troop(
             name="Spear Goblin",
             cost=2,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.THROWER, Traits.GOBLIN]
+            traits=_traits(Traits.THROWER, Traits.GOBLIN)
         )
         
         self.troops["giant_skeleton"] = Troop(
             name="Giant Skeleton",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.BRAWLER, Traits.UNDEAD]
+            traits=_traits(Traits.BRAWLER, Traits.UNDEAD)
         )
         
         self.troops["valkyrie"] = Troop(
             name="Valkyrie",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.CLAN, Traits.AVENGER]
+            traits=_traits(Traits.CLAN, Traits.AVENGER)
         )
         
         self.troops["pekka"] = Troop(
             name="P.E.K.K.A",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.JUGGERNAUT, Traits.ACE]
+            traits=_traits(Traits.JUGGERNAUT, Traits.ACE)
         )
         
         self.troops["prince"] = Troop(
             name="Prince",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.NOBLE, Traits.BRAWLER]
+            traits=_traits(Traits.NOBLE, Traits.BRAWLER)
         )
         
         self.troops["dart_goblin"] = Troop(
             name="Dart Goblin",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.RANGER, Traits.GOBLIN]
+            traits=_traits(Traits.RANGER, Traits.GOBLIN)
         )
         
         self.troops["executioner"] = Troop(
             name="Executioner",
             cost=3,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.THROWER, Traits.ACE]
+            traits=_traits(Traits.THROWER, Traits.ACE)
         )
         
         self.troops["goblin_machine"] = Troop(
             name="Goblin Machine",
             cost=4,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.JUGGERNAUT, Traits.GOBLIN]
+            traits=_traits(Traits.JUGGERNAUT, Traits.GOBLIN)
         )
         
         self.troops["princess"] = Troop(
             name="Princess",
             cost=4,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.RANGER, Traits.NOBLE]
+            traits=_traits(Traits.RANGER, Traits.NOBLE)
         )
         
         self.troops["bandit"] = Troop(
             name="Bandit",
             cost=4,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.ACE, Traits.AVENGER]
+            traits=_traits(Traits.ACE, Traits.AVENGER)
         )
         
         self.troops["royal_ghost"] = Troop(
             name="Royal Ghost",
             cost=4,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.UNDEAD, Traits.ASSASSIN]
+            traits=_traits(Traits.UNDEAD, Traits.ASSASSIN)
         )
         
         self.troops["mega_knight"] = Troop(
             name="Mega Knight",
             cost=4,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.BRAWLER, Traits.ACE]
+            traits=_traits(Traits.BRAWLER, Traits.ACE)
         )
         
         self.troops["archer_queen"] = Troop(
             name="Archer Queen",
             cost=5,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.CLAN, Traits.AVENGER]
+            traits=_traits(Traits.CLAN, Traits.AVENGER)
         )
         
         self.troops["skeleton_king"] = Troop(
             name="Skeleton King",
             cost=5,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.UNDEAD, Traits.JUGGERNAUT]
+            traits=_traits(Traits.UNDEAD, Traits.JUGGERNAUT)
         )
         
         self.troops["golden_knight"] = Troop(
             name="Golden Knight",
             cost=5,
             stars=MergeLevel.ONE_STAR,
-            traits=[Traits.NOBLE, Traits.ASSASSIN]
+            traits=_traits(Traits.NOBLE, Traits.ASSASSIN)
         )
     
     def get_troop(self, name: str) -> Optional[Troop]:
         """Get troop by name (case insensitive)"""
-        # Convert name to match our internal naming (handle spaces and cases)
-        normalized_name = name.lower().replace(" ", "_").replace(".", "")
-        return self.troops.get(normalized_name)
+        # Names come from a small fixed set of icons, so the normalization is cached
+        return self.troops.get(_normalize_troop_name(name))
     
     def get_troops_by_cost(self, cost: int) -> List[Troop]:
         """Get all troops with specific elixir cost"""
-        return [troop for troop in self.troops.values() if troop.cost == cost]
+        # Copies, so callers can't change the index
+        return list(self._by_cost.get(cost, ()))
     
     def get_troops_by_merge_level(self, merge_level: MergeLevel) -> List[Troop]:
         """Get all troops of specific merge level"""
-        return [troop for troop in self.troops.values() if troop.stars == merge_level]
+        return list(self._by_stars.get(merge_level, ()))
     
     def upgrade_troop_stars(self, troop_name: str, new_stars: MergeLevel) -> Optional[Troop]:
         """Upgrade a troop to a new merge level (returns new troop instance)"""
@@ -220,18 +260,18 @@ class TroopRegistry:
             name=base_troop.name,
             cost=base_troop.cost,
             stars=new_stars,
-            traits=base_troop.traits.copy()  # Keep same traits
+            traits=base_troop.traits  # Keep same traits (immutable, no copy needed)
         )
         
         return upgraded_troop
     
     def get_troops_with_trait(self, trait: Traits) -> List[Troop]:
         """Get all troops with specific trait"""
-        return [troop for troop in self.troops.values() if trait in troop.traits]
+        return list(self._by_trait.get(trait, ()))
     
     def get_all_troops(self) -> List[Troop]:
         """Get all troops sorted by cost"""
-        return sorted(self.troops.values(), key=lambda t: (t.cost, t.name))
+        return list(self._all_sorted)
     
     def print_summary(self):
         """Print a summary of all troops"""
@@ -250,8 +290,9 @@ class TroopRegistry:
 # Global registry instance
 TROOP_REGISTRY = TroopRegistry()
 
+@lru_cache(maxsize=256)
 def get_troop_by_icon_name(icon_name: str) -> Optional[Troop]:
-    """Helper function to get troop from icon detection"""
+    """Helper function to get troop from icon detection (cached - the registry never changes)"""
     return TROOP_REGISTRY.get_troop(icon_name)
 
 def get_troops_with_trait_name(trait_name: str) -> List[Troop]: